@@ -121,16 +121,10 @@ def _iter_csvs():
             yield p, province, "utf-8"
 
 
-def combine(output="data/all_entities.csv"):
-    out_path = ROOT / output
-    os.makedirs(out_path.parent, exist_ok=True)
-
-    all_rows = []
-    files_read = 0
-
+def iter_rows(skip: Path | None = None):
+    """Yield (csv_path, rows) for every CSV under data/, rows in the unified schema."""
     for csv_path, province, enc in _iter_csvs():
-        # Skip the output file if it already exists
-        if csv_path.resolve() == out_path.resolve():
+        if skip is not None and csv_path.resolve() == skip.resolve():
             continue
         try:
             with open(csv_path, encoding=enc, newline="") as fh:
@@ -138,14 +132,26 @@ def combine(output="data/all_entities.csv"):
                 headers = reader.fieldnames or []
                 legacy = _is_legacy_ministry_schema(headers)
                 batch = [_map_row(r, province, csv_path.stem, legacy) for r in reader]
-            # Drop completely empty rows (no name and no website)
-            batch = [r for r in batch if r["name"] or r["website"]]
-            all_rows.extend(batch)
-            files_read += 1
-            rel = csv_path.relative_to(ROOT) if csv_path.is_relative_to(ROOT) else csv_path.name
-            print(f"  {str(rel):<55}  {len(batch):>5} rows")
         except Exception as e:
             print(f"  [WARN] {csv_path.name}: {e}")
+            continue
+        # Drop completely empty rows (no name and no website)
+        yield csv_path, [r for r in batch if r["name"] or r["website"]]
+
+
+def combine(output="data/all_entities.csv"):
+    out_path = ROOT / output
+    os.makedirs(out_path.parent, exist_ok=True)
+
+    all_rows = []
+    files_read = 0
+
+    # Skip the output file if it already exists
+    for csv_path, batch in iter_rows(skip=out_path):
+        all_rows.extend(batch)
+        files_read += 1
+        rel = csv_path.relative_to(ROOT) if csv_path.is_relative_to(ROOT) else csv_path.name
+        print(f"  {str(rel):<55}  {len(batch):>5} rows")
 
     with open(out_path, "w", newline="", encoding="utf-8") as fh:
         writer = csv.DictWriter(fh, fieldnames=FIELDS, extrasaction="ignore")
@@ -0,0 +1,145 @@
+"""
+Compare data/all_entities.csv with the previous run and append what
+changed to a JSONL change feed.
+Output: data/changes.jsonl (feed), data/snapshot.json (state for next run)
+
+Rows are keyed by normalized (province, type, name); a key listed more
+than once is split by content (see _keyed), never by position, because
+the scrapers write rows in completion order. The snapshot keeps
+only a content hash per row, a short hash per field and the minister's
+name. The new file is read twice, once to count keys and once to diff
+against the snapshot, and only rows whose key repeats are held until
+the end: time is linear in the number of rows and memory in the number
+of keys plus repeated-key rows, however long the feed grows.
+
+Feed format: one JSON object per line with "run", "op" (added, removed
+or modified) and "key" ([province, type, name]). Added and modified
+entries carry the new "row"; modified ones also list the changed
+"fields". Entries whose minister changed carry "minister_name" with
+"old" and "new"; removed ones carry the last minister's name. When
+several rows share a key, the name gets a "#" tag: a hash of the
+website if that tells them apart, else a hash of the whole row. A
+row-hash tag changes with any field, so an edit to such a row is fed
+as removed + added, never as modified.
+"""
+import csv
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime, timezone
+from hashlib import blake2b
+from pathlib import Path
+
+from combine import FIELDS
+
+ROOT = Path(__file__).resolve().parent
+
+SNAPSHOT_VERSION = 1
+
+
+def _norm(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def row_key(row: dict) -> str:
+    """Normalized province / type / name, joined with a unit separator."""
+    return "\x1f".join((_norm(row.get("province", "")).upper(),
+                        _norm(row.get("type", "")),
+                        _norm(row.get("name", ""))))
+
+
+def _h(text: str, size: int) -> str:
+    return blake2b(text.encode("utf-8"), digest_size=size).hexdigest()
+
+
+def _fingerprint(row: dict) -> list:
+    """[row hash, per-field hashes, minister name]"""
+    vals = [(row.get(f) or "").strip() for f in FIELDS]
+    return [_h("\x1f".join(vals), 8), [_h(v, 4) for v in vals], vals[FIELDS.index("minister_name")]]
+
+
+def _keyed(path: Path):
+    """
+    (key, row) for every row of the CSV at path. Rows sharing a key get "#"
+    plus a short hash of their website when those tell them apart, else of
+    the whole row; identical rows are interchangeable, so their ".n" order
+    does not matter.
+    """
+    with open(path, encoding="utf-8", newline="") as fh:
+        counts = Counter(row_key(row) for row in csv.DictReader(fh))
+    groups = {}
+    with open(path, encoding="utf-8", newline="") as fh:
+        for row in csv.DictReader(fh):
+            key = row_key(row)
+            if counts[key] == 1:
+                yield key, row
+            else:
+                groups.setdefault(key, []).append(row)
+    for key, group in groups.items():
+        sites = [_norm(r.get("website", "")) for r in group]
+        by_site = all(sites) and len(set(sites)) == len(sites)
+        seen = {}
+        for row, site in zip(group, sites):
+            tag = _h(site, 4) if by_site else _fingerprint(row)[0]
+            seen[tag] = seen.get(tag, 0) + 1
+            yield f"{key}#{tag}" + (f".{seen[tag]}" if seen[tag] > 1 else ""), row
+
+
+def _load_snapshot(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            snap = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if snap.get("version") != SNAPSHOT_VERSION:
+        return {}
+    return snap.get("rows", {})
+
+
+def diff(source="data/all_entities.csv", feed="data/changes.jsonl", snapshot="data/snapshot.json"):
+    src, feed_path, snap_path = ROOT / source, ROOT / feed, ROOT / snapshot
+    old = _load_snapshot(snap_path)
+    new = {}
+    run = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    counts = {"added": 0, "removed": 0, "modified": 0}
+
+    os.makedirs(feed_path.parent, exist_ok=True)
+    with open(feed_path, "a", encoding="utf-8") as out:
+
+        def emit(op, key, **extra):
+            counts[op] += 1
+            out.write(json.dumps({"run": run, "op": op, "key": key.split("\x1f"), **extra},
+                                 ensure_ascii=False) + "\n")
+
+        for key, row in _keyed(src):
+            fp = new[key] = _fingerprint(row)
+            prev = old.pop(key, None)
+            if prev is None:
+                emit("added", key, row=row)
+            elif prev[0] != fp[0]:
+                changed = [f for f, a, b in zip(FIELDS, prev[1], fp[1]) if a != b]
+                extra = {}
+                if prev[2] != fp[2]:
+                    extra["minister_name"] = {"old": prev[2], "new": fp[2]}
+                emit("modified", key, fields=changed, row=row, **extra)
+
+        # Whatever is left in the old snapshot did not show up this run
+        for key, prev in old.items():
+            emit("removed", key, minister_name=prev[2])
+
+    tmp = snap_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"version": SNAPSHOT_VERSION, "run": run, "rows": new}, fh, ensure_ascii=False)
+    os.replace(tmp, snap_path)
+
+    print(f"  {counts['added']} added, {counts['removed']} removed, "
+          f"{counts['modified']} modified -> {feed_path.relative_to(ROOT)}")
+    return counts
+
+
+if __name__ == "__main__":
+    print("Diffing against the previous snapshot…\n")
+    diff()
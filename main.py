@@ -1,55 +1,159 @@
+import argparse
 import importlib
+import json
+import os
 import sys
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.append(str(Path(__file__).resolve().parent))
 from combine import combine
+from diff import diff
+from regions.registry import REGIONS
+from scripts import budget, seeds
+from scripts.budget import Budget
 
-MODULES = [
-    "regions.AB.alberta",
-    "regions.BC.bc",
-    "regions.MB.mb",
-    "regions.NB.nb",
-    "regions.NL.nl",
-    "regions.NS.ns",
-    "regions.NT.nt",
-    "regions.NU.nunavut",
-    "regions.ON.on",
-    "regions.PE.pe",
-    "regions.QC.qc",
-    "regions.SK.sk",
-    "regions.YT.yt",
-    "regions.FED.federal",
-]
-
-
-def _run(module_path: str):
+
+REPORT_PATH = "data/completeness.json"
+
+
+def _run(module_path: str, run_budget: Budget, region_seconds: float | None):
+    region = Budget(module_path, region_seconds, parent=run_budget)
+    if region.expired():
+        # The run window closed before this region got a worker
+        return module_path, "not started: run budget spent", region
     try:
-        mod = importlib.import_module(module_path)
-        if hasattr(mod, "main"):
+        with budget.scope(region):
+            mod = importlib.import_module(module_path)
+            if not hasattr(mod, "main"):
+                return module_path, "no main()", region
             mod.main()
-            return module_path, None
-        return module_path, "no main()"
+        return module_path, None, region
     except Exception as e:
-        return module_path, str(e)
+        return module_path, str(e), region
+    finally:
+        region.finish()
+
+
+def _write_report(results: list):
+    """Per-region completeness for this run, printed and saved as JSON."""
+    print("\nCompleteness:")
+    report = []
+    for path, err, region in results:
+        r = region.report()
+        r["status"] = "error" if err else ("partial" if r["skipped"] else "complete")
+        r["error"] = err
+        report.append(r)
+        print(f"  {path:<24} {r['status']:<8} {r['elapsed']:>7.1f}s  "
+              f"{r['fetched']} fetched, {r['skipped']} skipped ({r['completeness']:.0%})")
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
 
+def _select(spec, parser) -> list:
+    """'AB,ON' -> entry-point modules; None -> every region."""
+    if not spec:
+        return list(REGIONS.values())
+    codes = [c.strip().upper() for c in spec.split(",") if c.strip()]
+    unknown = [c for c in codes if c not in REGIONS]
+    if unknown:
+        parser.error(f"unknown region(s): {', '.join(unknown)} (choose from {', '.join(REGIONS)})")
+    return [REGIONS[c] for c in codes]
 
-def main():
-    print(f"Running {len(MODULES)} modules concurrently…\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape all regions, then combine.")
+    parser.add_argument(
+        "--regions", metavar="AB,ON",
+        help="comma-separated region codes to run (default: all)",
+    )
+    parser.add_argument(
+        "--processes", action="store_true",
+        help="parse and extract pages in a process pool sized to the CPU count",
+    )
+    parser.add_argument(
+        "--reextract", action="store_true",
+        help="re-run every extractor against the page archive, without touching the network",
+    )
+    parser.add_argument(
+        "--warm", action="store_true",
+        help="prefetch every statically known URL of the selected regions before scraping",
+    )
+    parser.add_argument(
+        "--max-age", type=float, metavar="SECONDS",
+        help="serve pages archived less than SECONDS ago (e.g. by warm.py) instead of refetching",
+    )
+    parser.add_argument(
+        "--fresh", action="store_true",
+        help="re-parse every page instead of reusing stored extraction results",
+    )
+    parser.add_argument(
+        "--budget", type=float, metavar="SECONDS",
+        help="wall-clock budget for the whole run; unfinished work is skipped and reported",
+    )
+    parser.add_argument(
+        "--region-budget", type=float, metavar="SECONDS",
+        help="wall-clock budget per region, counted from when it starts",
+    )
+    parser.add_argument(
+        "--hedge", action="store_true",
+        help="duplicate requests that outlive their domain's p95 latency (≤5%% extra requests)",
+    )
+    args = parser.parse_args(argv)
+    modules = _select(args.regions, parser)
+
+    # Only the selected regions (and what they need) get imported
+    if args.processes or args.fresh or args.reextract:
+        from scripts import pipeline
+        pipeline.use_processes(args.processes)
+        # A re-extract is run to pick up extractor changes, and the memo's
+        # code hash cannot see every helper an extractor calls
+        pipeline.use_extract_memo(not (args.fresh or args.reextract))
+    if args.hedge:
+        from scripts import common
+        common.use_hedging()
+    if args.reextract:
+        from scripts import common
+        common.use_archive_replay()
+    if args.max_age:
+        from scripts import common
+        common.use_archive_cache(args.max_age)
+    if args.warm:
+        from warm import warm
+        warm(modules)
+
+    # Replay is CPU-bound with nothing to be polite to: run every region at once
+    workers = len(modules) if args.reextract else 6
+    print(f"Running {len(modules)} modules concurrently…\n")
+    run_budget = Budget("run", args.budget)
+    results = []
     # 6 workers: enough to keep all I/O busy without overwhelming the machine
-    with ThreadPoolExecutor(max_workers=6) as ex:
-        futs = {ex.submit(_run, m): m for m in MODULES}
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futs = {ex.submit(_run, m, run_budget, args.region_budget): m for m in modules}
         for fut in as_completed(futs):
-            path, err = fut.result()
+            path, err, region = fut.result()
+            results.append((path, err, region))
             if err:
                 print(f"[ERROR] {path}: {err}")
             else:
                 print(f"[DONE]  {path}")
+    if "scripts.pipeline" in sys.modules:
+        sys.modules["scripts.pipeline"].shutdown()
+    if args.hedge:
+        h = common.hedge_stats()
+        print(f"Hedged {h['hedges']} of {h['requests']} eligible requests ({h['wins']} won)")
+
+    _write_report(sorted(results, key=lambda r: modules.index(r[0])))
+    # Websites found by search this run skip the search next run
+    seeds.save()
 
     print("\nMerging all output files…")
     combine()
 
+    print("\nRecording changes since the last run…")
+    diff()
+
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,14 @@
 import os
 import re
 import csv
-import requests
-from bs4 import BeautifulSoup
+import sys
+from pathlib import Path
 from urllib.parse import urljoin
 from config import minister_urls
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scripts.common import make_session, get_soup as _get_soup, parallel_imap
+
 PHONE_RE = re.compile(r'(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4})')
 SOCIAL_DOMAINS = {
     'twitter': 'twitter.com',
@@ -21,9 +24,10 @@ NOTICE_RE = re.compile(r'\b(information about|potential delays|affected by|affec
 KEYWORDS = ["employment", "social development", "canada", "department", "ministry", "esdc"]
 
 def get_soup(session, url):
-    resp = session.get(url, timeout=15)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, 'html.parser')
+    soup = _get_soup(session, url)
+    if soup is None:
+        raise RuntimeError(f"could not fetch {url}")
+    return soup
 
 def normalize_text(text):
     if not text:
@@ -270,13 +274,14 @@ def find_photo_near_name(soup, name, base_url):
                 return urljoin(base_url, img['src'])
     return None
 
-def get_ministry_data(session, name, url):
+def get_ministry_data(session, name, url, soup=None):
     print(f"\n--- Scraping ministry: {name} ---")
-    try:
-        soup = get_soup(session, url)
-    except Exception as e:
-        print(f"ERROR fetching {url}: {e}")
-        return None
+    if soup is None:
+        try:
+            soup = get_soup(session, url)
+        except Exception as e:
+            print(f"ERROR fetching {url}: {e}")
+            return None
 
     about = get_about(soup, ministry_name=name)
     socials = get_socials(soup)
@@ -288,14 +293,15 @@ def get_ministry_data(session, name, url):
         **socials
     }
 
-def get_minister_data(session, name, ministry_url, minister_url):
+def get_minister_data(session, name, ministry_url, minister_url, soup=None):
     minister_name = None
     minister_photo_url = None
     minister_url = minister_url or ""
     contact_info = ""
+    if soup is None:
+        soup = get_soup(session, ministry_url)
 
     if name == "Public Safety Canada":
-        soup = get_soup(session, ministry_url)
         about = get_about(soup, ministry_name=name)
         minister_anchor = find_minister_anchor(soup)
         if minister_anchor and minister_anchor.name == 'a' and minister_anchor.has_attr('href'):
@@ -324,7 +330,6 @@ def get_minister_data(session, name, ministry_url, minister_url):
         minister_photo_url = find_photo_near_name(soup, minister_name, ministry_url)
 
     elif name == 'Fisheries and Oceans Canada':
-        soup = get_soup(session, ministry_url)
         pattern = re.compile(r'The Honourable\s+([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)')
         for text in soup.stripped_strings:
             match = pattern.search(text)
@@ -360,7 +365,6 @@ def get_minister_data(session, name, ministry_url, minister_url):
         contact_info = "; ".join(contacts)
 
     elif name == "Canadian Heritage":
-        soup = get_soup(session, ministry_url)
         minister_name = find_minister_name_by_pattern(soup)
         minister_photo_url = find_photo_near_name(soup, minister_name, ministry_url)
         contacts = []
@@ -377,7 +381,6 @@ def get_minister_data(session, name, ministry_url, minister_url):
         contact_info = "; ".join(contacts)
 
     elif name == "Transport Canada":
-        soup = get_soup(session, ministry_url)
         minister_name = find_minister_name_by_pattern(soup)
         minister_photo_url = find_photo_near_name(soup, minister_name, ministry_url)
         contacts = []
@@ -394,7 +397,6 @@ def get_minister_data(session, name, ministry_url, minister_url):
         contact_info = "; ".join(contacts)
 
     elif name == "Department of Justice Canada":
-        soup = get_soup(session, ministry_url)
         corp_header = soup.find(lambda tag: tag.name in ['h2', 'h3'] and 'Corporate information' in tag.get_text(strip=True))
         if corp_header:
             for sib in corp_header.find_all_next():
@@ -450,7 +452,6 @@ def get_minister_data(session, name, ministry_url, minister_url):
         contact_info = "; ".join(contacts)
 
     else:
-        soup = get_soup(session, ministry_url)
         ministers_found = find_ministers(soup, ministry_url)
         if ministers_found:
             first_minister = ministers_found[0]
@@ -491,16 +492,27 @@ def get_minister_data(session, name, ministry_url, minister_url):
         "minister_url": minister_url
     }
 
+def _scrape_ministry(session, item):
+    ministry, (min_url, minister_url) = item
+    print(f"Scraping ministry: {ministry}")
+    try:
+        soup = get_soup(session, min_url)
+    except Exception as e:
+        print(f"ERROR fetching {min_url}: {e}")
+        return None
+    data = get_ministry_data(session, ministry, min_url, soup=soup)
+    data.update(get_minister_data(session, ministry, min_url, minister_url, soup=soup))
+    return data
+
 def scrape_ministries(output_file="data/FED/ministries_fed.csv"):
     os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
-    session = requests.Session()
+    session = make_session()
     headers = FIELDNAMES
     with open(output_file, 'w', newline='', encoding='utf-8') as file:
         writer = csv.DictWriter(file, fieldnames=headers)
         writer.writeheader()
-        for ministry, (min_url, minister_url) in minister_urls.items():
-            print(f"Scraping ministry: {ministry}")
-            data = get_ministry_data(session, ministry, min_url)
-            if data:
-                data.update(get_minister_data(session, ministry, min_url, minister_url))
-                writer.writerow(data)
\ No newline at end of file
+        # One task per ministry; rows are written in config order as they finish
+        items = list(minister_urls.items())
+        for data in parallel_imap(session, items, _scrape_ministry, max_workers=16):
+            writer.writerow(data)
+            file.flush()
@@ -4,18 +4,35 @@ Source: https://public-agency-list.alberta.ca/ (paginated, 25/page)
 """
 import sys
 import re
+import time
 from pathlib import Path
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scripts import budget, seeds, sitemap
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, duckduckgo, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, fetch_bytes, keep_bytes, streamed_get, extract_contacts,
+    open_writer, duckduckgo, report_latencies,
+    parse_html, archive_page, AGENCY_FIELDS, ENRICH_MAX_BYTES,
 )
+from scripts.pipeline import stream_scrape
 
 BASE_URL = "https://public-agency-list.alberta.ca"
 AB_BASE = "https://www.alberta.ca"
 
+# Agency pages come from the seed registry when already known, then the
+# alberta.ca sitemap. Without a usable sitemap, speculative mode races the
+# alberta.ca/{slug} probe against the search fallback instead of paying
+# for them back to back on every miss.
+SPECULATIVE = True
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=6)
+_H1_END = re.compile(rb"</h1\s*>", re.I)
+
+_latencies: list[float] = []
+_lat_lock = Lock()
+
 
 def _page_url(page_num):
     if page_num == 0:
@@ -79,41 +96,168 @@ def _name_to_slug(name):
     return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
 
 
-def _enrich(session, item):
-    name, ministry, desc = item
-    row = {
-        "province": "AB", "name": name,
-        "type": "Public Agency",
-        "description": desc,
-        "website": "",
-        "phone": "", "email": "", "address": "",
-        "parent_ministry": ministry,
-    }
+def _confirms(name, soup):
+    """True if the page h1 mentions one of the first two words of name."""
+    h1 = soup.find("h1") if soup else None
+    if not h1:
+        return False
+    h1 = h1.get_text(strip=True).lower()
+    return any(w.lower() in h1 for w in name.split()[:2])
 
-    # Try alberta.ca/{slug} first
-    slug = _name_to_slug(name)
-    candidate = f"{AB_BASE}/{slug}"
-    soup = get_soup(session, candidate, timeout=8)
-    if soup and soup.find("h1"):
-        h1 = soup.find("h1").get_text(strip=True)
-        # Confirm it's actually the right page
-        if any(w.lower() in h1.lower() for w in name.split()[:2]):
-            row["website"] = candidate
-            pt = soup.get_text(" ", strip=True)
-            row["phone"] = extract_phone(pt)
-            row["email"] = extract_email(pt)
-            return row
-
-    # Fall back to DuckDuckGo
+
+def _head_confirms(name, url, body, ctype):
+    """_confirms on the body up to its first </h1>; the tree is dropped at once."""
+    m = _H1_END.search(body)
+    head = parse_html(body[:m.end()] if m else body, url, ctype)
+    try:
+        return _confirms(name, head)
+    finally:
+        head.decompose()
+
+
+def _fetch_confirms(session, name, url, timeout=10):
+    """Fetch url as the extract step will, then check its h1."""
+    got = fetch_bytes(session, url, timeout=timeout, stream=True, max_bytes=ENRICH_MAX_BYTES)
+    return got is not None and _head_confirms(name, url, *got)
+
+
+class _Race:
+    """First contender to claim() wins; the others watch .done and bail out."""
+
+    def __init__(self):
+        self.done = Event()
+        self.winner = None
+        self._lock = Lock()
+
+    def claim(self, result) -> bool:
+        with self._lock:
+            if self.done.is_set():
+                return False
+            self.winner = result
+            self.done.set()
+            return True
+
+
+def _probe_slug(session, name, race):
+    """
+    Streamed GET of alberta.ca/{slug}. A miss costs only the response
+    headers; on a hit the body is read just far enough to check the h1,
+    and the rest is only downloaded once the race is won.
+    """
+    url = f"{AB_BASE}/{_name_to_slug(name)}"
+    try:
+        with streamed_get(session, url, timeout=8) as resp:
+            if resp is None or resp.status_code != 200:
+                return
+            buf = bytearray()
+            chunks = resp.iter_content(16384)
+            for chunk in chunks:
+                if race.done.is_set():
+                    return
+                buf += chunk
+                if _H1_END.search(buf):
+                    break
+            ctype = resp.headers.get("Content-Type", "")
+            if not _head_confirms(name, url, bytes(buf), ctype) or not race.claim((url, True)):
+                return
+            for chunk in chunks:
+                buf += chunk
+        archive_page(url, bytes(buf), ctype)
+        # The extract step reads the page from here instead of fetching it again
+        keep_bytes(url, bytes(buf), ctype)
+    except Exception as e:
+        print(f"[WARN] {url}: {e}")
+
+
+def _search(session, name, race):
+    """DuckDuckGo lookup + fetch; claims the race only if the h1 confirms."""
+    found = duckduckgo(f"{name} Alberta government", session, cancel=race.done)
+    if not found or race.done.is_set():
+        return found
+    if _fetch_confirms(session, name, found):
+        race.claim((found, True))
+    return found
+
+
+def _resolve_speculative(session, name):
+    race = _Race()
+    fut = _SEARCH_POOL.submit(budget.carry(_search), session, name, race)
+    _probe_slug(session, name, race)
+    if race.done.is_set():
+        # The loser is dropped if still queued; a running search sees race.done
+        fut.cancel()
+        return race.winner
+    found = fut.result()
+    if race.winner:
+        return race.winner
+    # Neither side confirmed: an unconfirmed search hit is still the fallback
+    return (found, False) if found else None
+
+
+def _resolve_seed(session, name):
+    """A website verified on an earlier run, if its page still confirms."""
+    url = seeds.registry().website("AB", name)
+    if not url or not _fetch_confirms(session, name, url):
+        return None
+    return url, True
+
+
+def _resolve_sitemap(session, index, name):
+    """Local lookup in the alberta.ca sitemap; only the page itself is fetched."""
+    url = index.lookup(name)
+    if not url or not _fetch_confirms(session, name, url):
+        return None
+    return url, True
+
+
+def _resolve_search(session, name):
     found = duckduckgo(f"{name} Alberta government", session)
-    if found:
-        row["website"] = found
-        s = get_soup(session, found, timeout=10)
-        if s:
-            pt = s.get_text(" ", strip=True)
-            row["phone"] = extract_phone(pt)
-            row["email"] = extract_email(pt)
+    if not found:
+        return None
+    return found, _fetch_confirms(session, name, found)
+
+
+def _resolve_serial(session, name):
+    # Try alberta.ca/{slug} first
+    candidate = f"{AB_BASE}/{_name_to_slug(name)}"
+    if _fetch_confirms(session, name, candidate, timeout=8):
+        return candidate, True
+    return _resolve_search(session, name)
 
+
+def _website(session, row):
+    """
+    url_fn: the agency page, from the seed registry, the sitemap, or the
+    slug probe and search. Resolution only reads page heads; the page is
+    parsed once, by the extract step.
+    """
+    t0 = time.perf_counter()
+    name = row["name"]
+    hit = _resolve_seed(session, name)
+    if hit is None:
+        index = sitemap.load(session, AB_BASE)
+        hit = _resolve_sitemap(session, index, name)
+        if hit is None and index:
+            # The sitemap lists every alberta.ca page: a miss means there is
+            # no slug to guess, so go straight to the search
+            hit = _resolve_search(session, name)
+        elif hit is None:
+            resolve = _resolve_speculative if SPECULATIVE else _resolve_serial
+            hit = resolve(session, name)
+    if hit:
+        row["website"], confirmed = hit
+        # An unconfirmed search fallback is used for this run but not recorded
+        if confirmed:
+            seeds.registry().remember("AB", name, row["website"], row["type"],
+                                      row["parent_ministry"], verified=True)
+    with _lat_lock:
+        _latencies.append(time.perf_counter() - t0)
+    return row["website"]
+
+
+def _extract(soup, row):
+    if soup is not None:
+        row.update(extract_contacts(soup))
     return row
 
 
@@ -121,9 +265,22 @@ def scrape_agencies(output_file="data/AB/agencies_ab.csv"):
     session = make_session()
     print("[AB] Collecting agencies from public-agency-list.alberta.ca…")
     triples = _collect_all(session)
-    print(f"[AB] Enriching {len(triples)} agencies concurrently…")
-    enriched = parallel_scrape(session, triples, _enrich, max_workers=6)
+    mode = "speculative" if SPECULATIVE else "serial"
+    print(f"[AB] Enriching {len(triples)} agencies concurrently ({mode})…")
+    rows = ({
+        "province": "AB", "name": name,
+        "type": "Public Agency",
+        "description": desc,
+        "website": "",
+        "phone": "", "email": "", "address": "",
+        "parent_ministry": ministry,
+    } for name, ministry, desc in triples)
+    _latencies.clear()
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(
+        session, rows, _extract, writer.writerow, url_fn=_website,
+        max_workers=6, timeout=10, stream=True, max_bytes=ENRICH_MAX_BYTES,
+    )
     f.close()
-    print(f"[AB] Saved {len(enriched)} -> {output_file}")
+    report_latencies("[AB] resolve", _latencies)
+    print(f"[AB] Saved {n} -> {output_file}")
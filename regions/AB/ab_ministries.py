@@ -8,9 +8,11 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = "https://www.alberta.ca/ministries"
 BASE = "https://www.alberta.ca"
@@ -35,7 +37,7 @@ def _ministry_links(session):
     return [(u, n) for u, n in links if u not in seen and not seen.add(u)]
 
 
-def _scrape_ministry(session, item):
+def _scrape_ministry(soup, item):
     url, name = item
     row = {
         "province": "AB", "type": "Ministry", "name": name,
@@ -44,7 +46,6 @@ def _scrape_ministry(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
@@ -53,9 +54,7 @@ def _scrape_ministry(session, item):
     if about_tag:
         row["about"] = about_tag.get_text(strip=True)
 
-    page_text = soup.get_text(" ", strip=True)
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "AB"))
 
     # Minister name: h3 containing "Minister" prefix
     for h3 in soup.find_all("h3"):
@@ -74,28 +73,19 @@ def _scrape_ministry(session, item):
         row["minister_photo_url"] = src if src.startswith("http") else BASE + src
 
     # Minister contact page
+    contact_url = ""
     for a in soup.find_all("a", href=True):
         lt = a.get_text(strip=True).lower()
         if "minister" in lt and "contact" in lt:
             href = a["href"]
             full = href if href.startswith("http") else urljoin(BASE, href)
             if full != url:
-                row["minister_url"] = full
-                ms = get_soup(session, full)
-                if ms:
-                    mt = ms.get_text(" ", strip=True)
-                    row["minister_phone"] = extract_phone(mt)
-                    row["minister_email"] = extract_email(mt)
+                row["minister_url"] = contact_url = full
                 break
 
-    addr = re.search(
-        r"\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?)[^\n]{0,80}(?:AB|Alberta|Edmonton|Calgary)",
-        page_text, re.I,
-    )
-    if addr:
-        row["address"] = addr.group(0).strip()
-
-    return {**row, **extract_socials(soup)}
+    if contact_url:
+        return FollowUp(contact_url, scrape_minister_contact, row)
+    return row
 
 
 def scrape_ministries(output_file="data/AB/ministries.csv"):
@@ -103,8 +93,7 @@ def scrape_ministries(output_file="data/AB/ministries.csv"):
     print("[AB] Fetching ministry list from alberta.ca/ministries…")
     links = _ministry_links(session)
     print(f"[AB] Scraping {len(links)} ministries concurrently…")
-    rows = parallel_scrape(session, links, _scrape_ministry)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, links, _scrape_ministry, writer.writerow, url_fn=pair_url)
     f.close()
-    print(f"[AB] Saved {len(rows)} -> {output_file}")
+    print(f"[AB] Saved {n} -> {output_file}")
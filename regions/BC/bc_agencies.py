@@ -5,9 +5,10 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, extract_contacts,
+    open_writer, AGENCY_FIELDS,
 )
+from scripts.pipeline import stream_scrape
 
 BASE = "https://www2.gov.bc.ca"
 SOURCES = [
@@ -48,16 +49,10 @@ def _harvest_links(session, url, default_type):
     return [(u, n, t) for u, n, t in results if u not in seen and not seen.add(u)]
 
 
-def _enrich(session, row):
-    url = row["website"]
-    if not url or not url.startswith("http"):
+def _extract(soup, row):
+    if soup is None:
         return row
-    soup = get_soup(session, url, timeout=12)
-    if not soup:
-        return row
-    text = soup.get_text(" ", strip=True)
-    row["phone"] = extract_phone(text)
-    row["email"] = extract_email(text)
+    row.update(extract_contacts(soup))
     main = soup.find("main") or soup.find("div", {"id": "content"}) or soup
     for p in main.find_all("p"):
         t = p.get_text(strip=True)
@@ -80,8 +75,7 @@ def scrape_agencies(output_file="data/BC/agencies_bc.csv"):
             })
 
     print(f"[BC] Enriching {len(all_rows)} agency records concurrently…")
-    enriched = parallel_scrape(session, all_rows, _enrich, max_workers=10)
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(session, all_rows, _extract, writer.writerow, max_workers=10, timeout=12)
     f.close()
-    print(f"[BC] Saved {len(enriched)} agencies → {output_file}")
+    print(f"[BC] Saved {n} agencies → {output_file}")
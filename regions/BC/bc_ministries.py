@@ -5,9 +5,11 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = (
     "https://www2.gov.bc.ca/gov/content/governments/"
@@ -32,7 +34,7 @@ def _ministry_links(session):
     return links
 
 
-def _scrape_ministry(session, item):
+def _scrape_ministry(soup, item):
     url, name = item
     row = {
         "province": "BC", "type": "Ministry", "name": name,
@@ -41,7 +43,6 @@ def _scrape_ministry(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
@@ -63,22 +64,18 @@ def _scrape_ministry(session, item):
         src = img.get("src", "")
         row["minister_photo_url"] = src if src.startswith("http") else BASE + src
 
-    page_text = soup.get_text(" ", strip=True)
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "BC"))
 
+    contact_url = ""
     for a in soup.find_all("a", href=True, string=re.compile(r"contact|minister", re.I)):
         href = a["href"]
         full = href if href.startswith("http") else BASE + href
-        row["minister_url"] = full
-        cs = get_soup(session, full)
-        if cs:
-            ct = cs.get_text(" ", strip=True)
-            row["minister_phone"] = extract_phone(ct)
-            row["minister_email"] = extract_email(ct)
+        row["minister_url"] = contact_url = full
         break
 
-    return {**row, **extract_socials(soup)}
+    if contact_url:
+        return FollowUp(contact_url, scrape_minister_contact, row)
+    return row
 
 
 def scrape_ministries(output_file="data/BC/ministries.csv"):
@@ -86,8 +83,9 @@ def scrape_ministries(output_file="data/BC/ministries.csv"):
     print("[BC] Fetching ministry list…")
     links = _ministry_links(session)
     print(f"[BC] Scraping {len(links)} ministries concurrently…")
-    rows = parallel_scrape(session, links, _scrape_ministry)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(
+        session, links, _scrape_ministry, writer.writerow, url_fn=pair_url, dedupe_urls=True,
+    )
     f.close()
-    print(f"[BC] Saved {len(rows)} ministries → {output_file}")
+    print(f"[BC] Saved {n} ministries → {output_file}")
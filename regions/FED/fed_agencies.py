@@ -8,9 +8,10 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, open_writer, AGENCY_FIELDS, ENRICH_MAX_BYTES,
 )
+from scripts.extract import scan_contacts, SOCIAL_FIELDS
+from scripts.pipeline import stream_scrape
 
 INDEX_URL = "https://www.canada.ca/en/government/dept.html"
 MUSEUMS_URL = "https://www.canada.ca/en/canadian-heritage/services/funding/museums.html"
@@ -64,19 +65,13 @@ def _scrape_museums(session):
     return rows
 
 
-def _enrich(session, row):
-    url = row.get("website", "")
-    if not url or not url.startswith("http"):
+def _extract(soup, row):
+    if soup is None:
         return row
-    soup = get_soup(session, url, timeout=12)
-    if not soup:
-        return row
-    text = soup.get_text(" ", strip=True)
-    row["phone"] = extract_phone(text)
-    row["email"] = extract_email(text)
+    found = scan_contacts(soup)
+    row["phone"], row["email"] = found["phone"], found["email"]
     # Stash social media in description since AGENCY_FIELDS has no social columns
-    socials = extract_socials(soup)
-    social_str = "; ".join(f"{k}: {v}" for k, v in socials.items() if v)
+    social_str = "; ".join(f"{k}: {found[k]}" for k in SOCIAL_FIELDS if found[k])
     if social_str:
         row["description"] = (row.get("description") or "") + " | " + social_str
     return row
@@ -91,8 +86,10 @@ def scrape_federal_agencies(output_file="data/FED/agencies_fed.csv"):
     rows.extend(museums)
 
     print(f"[FED] Enriching {len(rows)} records concurrently…")
-    enriched = parallel_scrape(session, rows, _enrich, max_workers=8)
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(
+        session, rows, _extract, writer.writerow,
+        max_workers=8, timeout=12, stream=True, max_bytes=ENRICH_MAX_BYTES,
+    )
     f.close()
-    print(f"[FED] Saved {len(enriched)} → {output_file}")
+    print(f"[FED] Saved {n} → {output_file}")
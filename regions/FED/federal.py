@@ -2,10 +2,11 @@
 import sys
 from pathlib import Path
 
-# Add both the project root and the hidden .FED directory to path
+# Add the project root, this directory and the hidden .FED directory to path
 _root = Path(__file__).resolve().parents[2]
 _fed_dir = Path(__file__).resolve().parent.parent / ".FED"
 sys.path.insert(0, str(_root))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 sys.path.insert(0, str(_fed_dir))
 
 from fed_ministries import scrape_ministries
@@ -3,9 +3,10 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, duckduckgo, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, extract_agency_page, open_writer,
+    find_website, AGENCY_FIELDS, ENRICH_MAX_BYTES,
 )
+from scripts.pipeline import stream_scrape
 
 BASE = "https://www.gov.mb.ca"
 SOURCES = [
@@ -57,21 +58,8 @@ def _harvest_from_web(session):
     return extra
 
 
-def _enrich(session, row):
-    if not row["website"]:
-        row["website"] = duckduckgo(f"{row['name']} Manitoba", session) or ""
-    if row["website"] and row["website"].startswith("http"):
-        s = get_soup(session, row["website"], timeout=10)
-        if s:
-            pt = s.get_text(" ", strip=True)
-            row["phone"] = extract_phone(pt)
-            row["email"] = extract_email(pt)
-            for p in s.find_all("p"):
-                t = p.get_text(strip=True)
-                if len(t) > 60:
-                    row["description"] = t
-                    break
-    return row
+def _website(session, row):
+    return find_website(session, row, f"{row['name']} Manitoba")
 
 
 def scrape_agencies(output_file="data/MB/agencies_mb.csv"):
@@ -89,8 +77,11 @@ def scrape_agencies(output_file="data/MB/agencies_mb.csv"):
             all_rows.append(r)
 
     print(f"[MB] Enriching {len(all_rows)} records concurrently…")
-    enriched = parallel_scrape(session, all_rows, _enrich, max_workers=10)
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(
+        session, all_rows, extract_agency_page, writer.writerow, url_fn=_website,
+        max_workers=10, timeout=10, stream=True, max_bytes=ENRICH_MAX_BYTES,
+        reuse_same_pages=True,
+    )
     f.close()
-    print(f"[MB] Saved {len(enriched)} → {output_file}")
+    print(f"[MB] Saved {n} → {output_file}")
@@ -1,8 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+import sys
 import time
+from pathlib import Path
 
 from urllib.parse import urlparse, parse_qs, unquote
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scripts.common import duckduckgo
 import csv
 
 # input search terms
@@ -158,18 +161,8 @@ def url_extractinator(ddg_url):
     return ddg_url
 
 def search_duckduckgo(query):
-    base_url = "https://duckduckgo.com/html/"
-    params = {"q": query}
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        result = soup.select_one("a.result__a")
-        return result["href"] if result else None
-    except Exception as e:
-        print(f"Error for '{query}': {e}")
-        return None
+    # Through the shared session: archived, and replayed by --reextract
+    return duckduckgo(query) or None
 
 def main():
     results = []
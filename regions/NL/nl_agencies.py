@@ -4,9 +4,10 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, extract_agency_page, open_writer,
+    AGENCY_FIELDS, ENRICH_MAX_BYTES,
 )
+from scripts.pipeline import stream_scrape
 
 BASE = "https://www.gov.nl.ca"
 SOURCES = [
@@ -53,21 +54,6 @@ def _harvest_from_web(session):
     return extra
 
 
-def _enrich(session, row):
-    if row["website"] and row["website"].startswith("http"):
-        s = get_soup(session, row["website"], timeout=10)
-        if s:
-            pt = s.get_text(" ", strip=True)
-            row["phone"] = extract_phone(pt)
-            row["email"] = extract_email(pt)
-            for p in s.find_all("p"):
-                t = p.get_text(strip=True)
-                if len(t) > 60:
-                    row["description"] = t
-                    break
-    return row
-
-
 def scrape_agencies(output_file="data/NL/agencies_nl.csv"):
     session = make_session()
     all_rows = [{
@@ -83,8 +69,11 @@ def scrape_agencies(output_file="data/NL/agencies_nl.csv"):
             all_rows.append(r)
 
     print(f"[NL] Enriching {len(all_rows)} records concurrently…")
-    enriched = parallel_scrape(session, all_rows, _enrich, max_workers=10)
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(
+        session, all_rows, extract_agency_page, writer.writerow,
+        max_workers=10, timeout=10, stream=True, max_bytes=ENRICH_MAX_BYTES,
+        reuse_same_pages=True,
+    )
     f.close()
-    print(f"[NL] Saved {len(enriched)} → {output_file}")
+    print(f"[NL] Saved {n} → {output_file}")
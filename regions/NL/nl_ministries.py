@@ -5,9 +5,11 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = "https://www.gov.nl.ca/departments/"
 BASE = "https://www.gov.nl.ca"
@@ -31,7 +33,7 @@ def _dept_links(session):
     return [(u, n) for u, n in links if u not in seen and not seen.add(u)]
 
 
-def _scrape_dept(session, item):
+def _scrape_dept(soup, item):
     url, name = item
     row = {
         "province": "NL", "type": "Department", "name": name,
@@ -40,19 +42,16 @@ def _scrape_dept(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
-    page_text = soup.get_text(" ", strip=True)
     for p in (soup.find("main") or soup.find("div", {"id": "content"}) or soup).find_all("p"):
         t = p.get_text(strip=True)
         if len(t) > 80:
             row["about"] = t
             break
 
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "NL"))
 
     for tag in soup.find_all(["h2", "h3", "h4", "strong"]):
         t = tag.get_text(strip=True)
@@ -66,25 +65,19 @@ def _scrape_dept(session, item):
             row["minister_photo_url"] = src if src.startswith("http") else BASE + src
             break
 
+    contact_url = ""
     for a in soup.find_all("a", href=True):
         lt = a.get_text(strip=True).lower()
         if "contact" in lt or "minister" in lt:
             href = a["href"]
             full = href if href.startswith("http") else urljoin(BASE, href)
             if full != url:
-                row["minister_url"] = full
-                cs = get_soup(session, full)
-                if cs:
-                    ct = cs.get_text(" ", strip=True)
-                    row["minister_phone"] = extract_phone(ct)
-                    row["minister_email"] = extract_email(ct)
+                row["minister_url"] = contact_url = full
                 break
 
-    addr = re.search(r"\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?),?\s*\w[\w\s]*,?\s*(?:NL|St\. John)", page_text, re.I)
-    if addr:
-        row["address"] = addr.group(0).strip()
-
-    return {**row, **extract_socials(soup)}
+    if contact_url:
+        return FollowUp(contact_url, scrape_minister_contact, row)
+    return row
 
 
 def scrape_ministries(output_file="data/NL/ministries.csv"):
@@ -92,8 +85,7 @@ def scrape_ministries(output_file="data/NL/ministries.csv"):
     print("[NL] Fetching department list…")
     links = _dept_links(session)
     print(f"[NL] Scraping {len(links)} departments concurrently…")
-    rows = parallel_scrape(session, links, _scrape_dept)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, links, _scrape_dept, writer.writerow, url_fn=pair_url)
     f.close()
-    print(f"[NL] Saved {len(rows)} → {output_file}")
+    print(f"[NL] Saved {n} → {output_file}")
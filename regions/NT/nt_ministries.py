@@ -4,9 +4,11 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = "https://www.gov.nt.ca/en/departments"
 BASE = "https://www.gov.nt.ca"
@@ -30,7 +32,7 @@ def _dept_links(session):
     return [(u, n) for u, n in links if u not in seen and not seen.add(u)]
 
 
-def _scrape_dept(session, item):
+def _scrape_dept(soup, item):
     url, name = item
     row = {
         "province": "NT", "type": "Department", "name": name,
@@ -39,19 +41,16 @@ def _scrape_dept(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
-    page_text = soup.get_text(" ", strip=True)
     for p in (soup.find("main") or soup).find_all("p"):
         t = p.get_text(strip=True)
         if len(t) > 80:
             row["about"] = t
             break
 
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "NT"))
 
     for tag in soup.find_all(["h2", "h3", "h4", "strong"]):
         t = tag.get_text(strip=True)
@@ -65,25 +64,19 @@ def _scrape_dept(session, item):
             row["minister_photo_url"] = src if src.startswith("http") else BASE + src
             break
 
+    contact_url = ""
     for a in soup.find_all("a", href=True):
         lt = a.get_text(strip=True).lower()
         if "contact" in lt or "minister" in lt:
             href = a["href"]
             full = href if href.startswith("http") else BASE + href
             if full != url:
-                row["minister_url"] = full
-                cs = get_soup(session, full)
-                if cs:
-                    ct = cs.get_text(" ", strip=True)
-                    row["minister_phone"] = extract_phone(ct)
-                    row["minister_email"] = extract_email(ct)
+                row["minister_url"] = contact_url = full
                 break
 
-    addr = re.search(r'\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?),?\s*\w[\w\s]*,?\s*NT', page_text, re.I)
-    if addr:
-        row["address"] = addr.group(0).strip()
-
-    return {**row, **extract_socials(soup)}
+    if contact_url:
+        return FollowUp(contact_url, scrape_minister_contact, row)
+    return row
 
 
 def scrape_ministries(output_file="data/NT/ministries.csv"):
@@ -91,8 +84,7 @@ def scrape_ministries(output_file="data/NT/ministries.csv"):
     print("[NT] Fetching department list…")
     links = _dept_links(session)
     print(f"[NT] Scraping {len(links)} departments concurrently…")
-    rows = parallel_scrape(session, links, _scrape_dept)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, links, _scrape_dept, writer.writerow, url_fn=pair_url)
     f.close()
-    print(f"[NT] Saved {len(rows)} → {output_file}")
+    print(f"[NT] Saved {n} → {output_file}")
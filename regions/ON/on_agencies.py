@@ -10,9 +10,10 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, parallel_scrape, AGENCY_FIELDS,
+    make_session, get_soup, extract_phone, extract_contacts,
+    open_writer, AGENCY_FIELDS,
 )
+from scripts.pipeline import stream_scrape
 
 INDEX_URL = "https://www.pas.gov.on.ca/Home/Agencies-list"
 BASE = "https://www.pas.gov.on.ca"
@@ -59,13 +60,8 @@ def _dl_value(soup, label):
     return ""
 
 
-def _enrich(session, row):
-    detail_url = row.get("website", "")
-    if not detail_url.startswith("http"):
-        return row
-
-    soup = get_soup(session, detail_url, timeout=12)
-    if not soup:
+def _extract(soup, row):
+    if soup is None:
         return row
 
     # Parse structured dl fields on PAS detail pages
@@ -97,7 +93,7 @@ def _enrich(session, row):
         row["type"] = cls_text
 
     if not row["email"]:
-        row["email"] = extract_email(soup.get_text(" ", strip=True))
+        row["email"] = extract_contacts(soup)["email"]
 
     return row
 
@@ -107,8 +103,7 @@ def scrape_agencies(output_file="data/ON/agencies_on.csv"):
     print("[ON] Building agency list from pas.gov.on.ca…")
     rows = _build_rows(session)
     print(f"[ON] Enriching {len(rows)} agencies concurrently…")
-    enriched = parallel_scrape(session, rows, _enrich, max_workers=10)
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(session, rows, _extract, writer.writerow, max_workers=10, timeout=12)
     f.close()
-    print(f"[ON] Saved {len(enriched)} -> {output_file}")
+    print(f"[ON] Saved {n} -> {output_file}")
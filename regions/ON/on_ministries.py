@@ -5,9 +5,11 @@ from urllib.parse import urljoin
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = "https://www.ontario.ca/page/ministries"
 BASE = "https://www.ontario.ca"
@@ -28,7 +30,7 @@ def _ministry_links(session):
     return [(u, n) for u, n in links if u not in seen and not seen.add(u)]
 
 
-def _scrape_ministry(session, item):
+def _scrape_ministry(soup, item):
     url, name = item
     row = {
         "province": "ON", "type": "Ministry", "name": name,
@@ -37,7 +39,6 @@ def _scrape_ministry(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
@@ -48,9 +49,7 @@ def _scrape_ministry(session, item):
             row["about"] = t
             break
 
-    page_text = soup.get_text(" ", strip=True)
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "ON"))
 
     for tag in soup.find_all(["h2", "h3", "h4", "p"]):
         t = tag.get_text(strip=True)
@@ -68,25 +67,20 @@ def _scrape_ministry(session, item):
         if re.search(r"/page/minister-of", href, re.I):
             full = href if href.startswith("http") else BASE + href
             row["minister_url"] = full
-            ms = get_soup(session, full)
-            if ms:
-                mt = ms.get_text(" ", strip=True)
-                row["minister_phone"] = extract_phone(mt)
-                row["minister_email"] = extract_email(mt)
-                mimg = ms.find("img", src=re.compile(r"minister|portrait|headshot", re.I))
-                if mimg and not row["minister_photo_url"]:
-                    src = mimg.get("src", "")
-                    row["minister_photo_url"] = src if src.startswith("http") else BASE + src
-            break
+            return FollowUp(full, _scrape_minister_page, row)
+
+    return row
 
-    addr = re.search(
-        r'\d+\s+\w[\w\s]+(?:Street|Ave|Avenue|Blvd|Drive|Road|St\.?),?\s*\w[\w\s]*,\s*ON',
-        page_text, re.I,
-    )
-    if addr:
-        row["address"] = addr.group(0).strip()
 
-    return {**row, **extract_socials(soup)}
+def _scrape_minister_page(soup, row):
+    """FollowUp step: minister contacts, plus the portrait if the ministry page had none."""
+    row = scrape_minister_contact(soup, row)
+    if soup and not row["minister_photo_url"]:
+        mimg = soup.find("img", src=re.compile(r"minister|portrait|headshot", re.I))
+        if mimg:
+            src = mimg.get("src", "")
+            row["minister_photo_url"] = src if src.startswith("http") else BASE + src
+    return row
 
 
 def scrape_ministries(output_file="data/ON/ministries.csv"):
@@ -94,8 +88,7 @@ def scrape_ministries(output_file="data/ON/ministries.csv"):
     print("[ON] Fetching ministry list…")
     links = _ministry_links(session)
     print(f"[ON] Scraping {len(links)} ministries concurrently…")
-    rows = parallel_scrape(session, links, _scrape_ministry)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, links, _scrape_ministry, writer.writerow, url_fn=pair_url)
     f.close()
-    print(f"[ON] Saved {len(rows)} → {output_file}")
+    print(f"[ON] Saved {n} → {output_file}")
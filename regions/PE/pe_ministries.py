@@ -9,9 +9,11 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, FollowUp
 
 BASE = "https://www.princeedwardisland.ca"
 
@@ -33,7 +35,12 @@ PE_DEPARTMENTS = [
 ]
 
 
-def _scrape_dept(session, item):
+def _dept_url(session, item):
+    """url_fn for the (name, url) pairs above."""
+    return item[1]
+
+
+def _scrape_dept(soup, item):
     name, url = item
     row = {
         "province": "PE", "type": "Department", "name": name,
@@ -42,11 +49,9 @@ def _scrape_dept(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
-    page_text = soup.get_text(" ", strip=True)
     main = soup.find("main") or soup
     for p in main.find_all("p"):
         t = p.get_text(strip=True)
@@ -54,8 +59,7 @@ def _scrape_dept(session, item):
             row["about"] = t
             break
 
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "PE"))
 
     for tag in soup.find_all(["h2", "h3", "strong"]):
         t = tag.get_text(strip=True)
@@ -69,35 +73,25 @@ def _scrape_dept(session, item):
             row["minister_photo_url"] = src if src.startswith("http") else BASE + src
             break
 
+    contact_url = ""
     for a in soup.find_all("a", href=True):
         lt = a.get_text(strip=True).lower()
         if "contact" in lt or "minister" in lt:
             href = a["href"]
             full = href if href.startswith("http") else BASE + href
             if full != url:
-                row["minister_url"] = full
-                cs = get_soup(session, full)
-                if cs:
-                    ct = cs.get_text(" ", strip=True)
-                    row["minister_phone"] = extract_phone(ct)
-                    row["minister_email"] = extract_email(ct)
+                row["minister_url"] = contact_url = full
                 break
 
-    addr = re.search(
-        r"\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?)[^\n]{0,60}(?:PE|PEI|Charlottetown)",
-        page_text, re.I,
-    )
-    if addr:
-        row["address"] = addr.group(0).strip()
-
-    return {**row, **extract_socials(soup)}
+    if contact_url:
+        return FollowUp(contact_url, scrape_minister_contact, row)
+    return row
 
 
 def scrape_ministries(output_file="data/PE/ministries.csv"):
     session = make_session()
     print(f"[PE] Scraping {len(PE_DEPARTMENTS)} departments concurrently…")
-    rows = parallel_scrape(session, PE_DEPARTMENTS, _scrape_dept)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, PE_DEPARTMENTS, _scrape_dept, writer.writerow, url_fn=_dept_url)
     f.close()
-    print(f"[PE] Saved {len(rows)} -> {output_file}")
+    print(f"[PE] Saved {n} -> {output_file}")
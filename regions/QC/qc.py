@@ -4,10 +4,17 @@ import os
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 import scraper as qc_scraper
 import csv
 from qc_agencies import scrape_agencies
+from scripts.common import make_session, parallel_imap
+
+
+def _scrape_dept(session, link):
+    print(f"  Department: {link}")
+    return qc_scraper.scrape_ministries(link, session)
 
 
 def main():
@@ -15,15 +22,12 @@ def main():
 
     # Ministries
     print("[QC] Scraping ministries…")
-    all_dept_links = qc_scraper.get_dep_links(qc_scraper.BASE_URL)
+    session = make_session()
+    all_dept_links = qc_scraper.get_dep_links(qc_scraper.BASE_URL, session)
     all_data = []
-    for idx, link in enumerate(all_dept_links):
-        print(f"  Department #{idx + 1}: {link}")
-        try:
-            dept_data = qc_scraper.scrape_ministries(link)
-            all_data.extend(dept_data)
-        except Exception as e:
-            print(f"  [WARN] {link}: {e}")
+    # Departments run concurrently; results come back in department order
+    for dept_data in parallel_imap(session, all_dept_links, _scrape_dept):
+        all_data.extend(dept_data)
 
     output = "data/QC/ministries.csv"
     with open(output, "w", newline="", encoding="utf-8") as f:
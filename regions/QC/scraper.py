@@ -1,18 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+import sys
+import copy
+from pathlib import Path
 from urllib.parse import urljoin
 import csv
 
-BASE_URL = "https://www.quebec.ca/en/government/departments-agencies"
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from scripts.common import make_session, get_soup
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0"
-}
+BASE_URL = "https://www.quebec.ca/en/government/departments-agencies"
 
-def get_dep_links(index_url):
-    resp = requests.get(index_url, headers=HEADERS)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+def get_dep_links(index_url, session=None):
+    session = session or make_session()
+    soup = get_soup(session, index_url)
+    if not soup:
+        return []
     links = []
 
     ul = soup.find("ul", class_="listeCategoriesMinisteres")
@@ -29,11 +30,11 @@ def get_dep_links(index_url):
     print(f"Found {len(links)} departments")
     return list(links)
 
-def scrape_ministries(url):
-    resp = requests.get(url, headers=HEADERS)
-    resp.encoding = 'utf-8'
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+def scrape_ministries(url, session=None):
+    session = session or make_session()
+    soup = get_soup(session, url, encoding="utf-8")
+    if not soup:
+        return []
 
     # --- TITLE ---
     page_title = soup.title.string.split("|")[0].strip() if soup.title else ""
@@ -67,6 +68,8 @@ def scrape_ministries(url):
                 ps = body.find_all("p")
                 clean_paragraphs = []
                 for p in ps:
+                    # Pages are shared through the fetch memo; edit a copy
+                    p = copy.copy(p)
                     if p.find("a") or any(word in p.get_text(strip=True).lower() for word in ["email", "courriel", "agenda", "contact"]):
                         continue
                     for br in p.find_all("br"):
@@ -106,13 +109,14 @@ def scrape_ministries(url):
     return results
 
 def main():
-    all_dept_links = get_dep_links(BASE_URL)
+    session = make_session()
+    all_dept_links = get_dep_links(BASE_URL, session)
     all_data = []
 
     for idx, link in enumerate(all_dept_links):
         print(f"\n--- Department #{idx + 1} ---")
         try:
-            dept_data = scrape_ministries(link)
+            dept_data = scrape_ministries(link, session)
             all_data.extend(dept_data)
         except Exception as e:
             print(f"Error scraping {link}: {e}")
@@ -4,9 +4,11 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    extract_socials, open_writer, parallel_scrape, MINISTRY_FIELDS,
+    make_session, get_soup, scrape_minister_contact,
+    open_writer, MINISTRY_FIELDS,
 )
+from scripts.extract import scan_contacts
+from scripts.pipeline import stream_scrape, pair_url, FollowUp
 
 INDEX_URL = "https://www.saskatchewan.ca/government/government-structure/ministries"
 BASE = "https://www.saskatchewan.ca"
@@ -28,7 +30,7 @@ def _ministry_links(session):
     return [(u, n) for u, n in links if u not in seen and not seen.add(u)]
 
 
-def _scrape_ministry(session, item):
+def _scrape_ministry(soup, item):
     url, name = item
     row = {
         "province": "SK", "type": "Ministry", "name": name,
@@ -37,20 +39,17 @@ def _scrape_ministry(session, item):
         "minister_name": "", "minister_phone": "", "minister_email": "",
         "minister_url": "", "minister_photo_url": "",
     }
-    soup = get_soup(session, url)
     if not soup:
         return {**row, **{"twitter": "", "facebook": "", "youtube": "", "instagram": ""}}
 
     main = soup.find("main") or soup.find("div", {"id": "main-content"}) or soup
-    page_text = soup.get_text(" ", strip=True)
     for p in main.find_all("p"):
         t = p.get_text(strip=True)
         if len(t) > 80:
             row["about"] = t
             break
 
-    row["phone"] = extract_phone(page_text)
-    row["email"] = extract_email(page_text)
+    row.update(scan_contacts(soup, "SK"))
 
     for tag in soup.find_all(["h2", "h3", "h4"]):
         t = tag.get_text(strip=True)
@@ -69,21 +68,9 @@ def _scrape_ministry(session, item):
         href = a["href"]
         full = href if href.startswith("http") else BASE + href
         row["minister_url"] = full
-        cs = get_soup(session, full)
-        if cs:
-            ct = cs.get_text(" ", strip=True)
-            row["minister_phone"] = extract_phone(ct)
-            row["minister_email"] = extract_email(ct)
-        break
+        return FollowUp(full, scrape_minister_contact, row)
 
-    addr = re.search(
-        r'\d+\s+\w[\w\s]+(?:Street|Ave|Avenue|Drive|Road|St\.?),?\s*\w[\w\s]*,?\s*SK',
-        page_text, re.I,
-    )
-    if addr:
-        row["address"] = addr.group(0).strip()
-
-    return {**row, **extract_socials(soup)}
+    return row
 
 
 def scrape_ministries(output_file="data/SK/ministries.csv"):
@@ -91,8 +78,7 @@ def scrape_ministries(output_file="data/SK/ministries.csv"):
     print("[SK] Fetching ministry list…")
     links = _ministry_links(session)
     print(f"[SK] Scraping {len(links)} ministries concurrently…")
-    rows = parallel_scrape(session, links, _scrape_ministry)
     f, writer = open_writer(output_file, MINISTRY_FIELDS)
-    writer.writerows(rows)
+    n = stream_scrape(session, links, _scrape_ministry, writer.writerow, url_fn=pair_url)
     f.close()
-    print(f"[SK] Saved {len(rows)} → {output_file}")
+    print(f"[SK] Saved {n} → {output_file}")
@@ -1,12 +1,15 @@
 import sys
 import re
+from itertools import chain
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 from scripts.common import (
-    make_session, get_soup, extract_phone, extract_email,
-    open_writer, duckduckgo, parallel_scrape, AGENCY_FIELDS,
+    make_session, extract_agency_page, open_writer,
+    find_website, AGENCY_FIELDS, ENRICH_MAX_BYTES,
 )
+from scripts.harvest import ListingWalker, harvest
+from scripts.pipeline import stream_scrape
 
 BASE = "https://yukon.ca"
 INDEX_URL = "https://yukon.ca/en/government/departments-and-entities"
@@ -35,53 +38,19 @@ YUKON_ENTITIES = [
 ]
 
 
-def _dynamic_harvest(session):
-    soup = get_soup(session, INDEX_URL)
-    if not soup:
-        return []
-    rows = []
-    current_section = ""
-    for tag in (soup.find("main") or soup).find_all(["h2", "h3", "li"]):
-        tn, text = tag.name, tag.get_text(strip=True)
-        if tn in ("h2", "h3"):
-            current_section = text
-            continue
-        if tn == "li":
-            a = tag.find("a", href=True)
-            name = a.get_text(strip=True) if a else text
-            href = a["href"] if a else ""
-            if not name or len(name) < 5:
-                continue
-            full = href if href.startswith("http") else BASE + href
-            if re.search(r"crown|corporation", current_section, re.I):
-                etype = "Crown Corporation"
-            elif re.search(r"board|commission|tribunal", current_section, re.I):
-                etype = "Board / Commission"
-            else:
-                etype = "Agency"
-            rows.append({
-                "province": "YT", "type": etype, "name": name,
-                "description": "", "website": full,
-                "phone": "", "email": "", "address": "", "parent_ministry": current_section,
-            })
-    return rows
+def _section_type(section, default_type):
+    if re.search(r"crown|corporation", section, re.I):
+        return "Crown Corporation"
+    if re.search(r"board|commission|tribunal", section, re.I):
+        return "Board / Commission"
+    return default_type
 
 
-def _enrich(session, row):
-    if not row["website"]:
-        row["website"] = duckduckgo(f"{row['name']} Yukon", session) or ""
-    if row["website"] and row["website"].startswith("http"):
-        s = get_soup(session, row["website"], timeout=10)
-        if s:
-            pt = s.get_text(" ", strip=True)
-            row["phone"] = extract_phone(pt)
-            row["email"] = extract_email(pt)
-            for p in s.find_all("p"):
-                t = p.get_text(strip=True)
-                if len(t) > 60:
-                    row["description"] = t
-                    break
-    return row
+WALKER = ListingWalker(headings=("h2", "h3"), min_name=5, type_fn=_section_type)
+
+
+def _website(session, row):
+    return find_website(session, row, f"{row['name']} Yukon")
 
 
 def scrape_agencies(output_file="data/YT/agencies_yt.csv"):
@@ -92,15 +61,16 @@ def scrape_agencies(output_file="data/YT/agencies_yt.csv"):
         "parent_ministry": ministry,
     } for name, website, etype, ministry in YUKON_ENTITIES]
 
-    dynamic = _dynamic_harvest(session)
     existing = {r["name"].lower() for r in all_rows}
-    for r in dynamic:
-        if r["name"].lower() not in existing:
-            all_rows.append(r)
+    dynamic = harvest(session, [(INDEX_URL, "Agency")], WALKER, "YT")
+    all_rows = chain(all_rows, (r for r in dynamic if r["name"].lower() not in existing))
 
-    print(f"[YT] Enriching {len(all_rows)} records concurrently…")
-    enriched = parallel_scrape(session, all_rows, _enrich, max_workers=10)
+    print("[YT] Enriching records as the index is parsed…")
     f, writer = open_writer(output_file, AGENCY_FIELDS)
-    writer.writerows(enriched)
+    n = stream_scrape(
+        session, all_rows, extract_agency_page, writer.writerow, url_fn=_website,
+        max_workers=10, timeout=10, stream=True, max_bytes=ENRICH_MAX_BYTES,
+        reuse_same_pages=True,
+    )
     f.close()
-    print(f"[YT] Saved {len(enriched)} → {output_file}")
+    print(f"[YT] Saved {n} → {output_file}")
@@ -0,0 +1,20 @@
+"""
+Region code -> entry-point module for main.py.
+Kept free of imports so selecting regions costs nothing until they run.
+"""
+REGIONS = {
+    "AB": "regions.AB.alberta",
+    "BC": "regions.BC.bc",
+    "MB": "regions.MB.mb",
+    "NB": "regions.NB.nb",
+    "NL": "regions.NL.nl",
+    "NS": "regions.NS.ns",
+    "NT": "regions.NT.nt",
+    "NU": "regions.NU.nunavut",
+    "ON": "regions.ON.on",
+    "PE": "regions.PE.pe",
+    "QC": "regions.QC.qc",
+    "SK": "regions.SK.sk",
+    "YT": "regions.YT.yt",
+    "FED": "regions.FED.federal",
+}
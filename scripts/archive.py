@@ -0,0 +1,186 @@
+"""
+Append-only, zstd-compressed page archive with a URL/time index.
+
+Every page the fetch layer downloads is stored as a WARC 1.1 `resource`
+record compressed as its own zstd frame and appended to the current
+segment (archive/pages-<time>-<pid>.warc.zst), so a single record can be
+read back by seeking to its offset. index.sqlite maps URL and fetch time
+to (segment, offset, length); a page whose bytes did not change since it
+was last archived only gets a new index row.
+
+ArchiveAdapter serves a requests.Session straight from the archive,
+which is how main.py --reextract re-runs every extractor with no network.
+"""
+import io
+import os
+import time
+import uuid
+import sqlite3
+from hashlib import sha1
+from base64 import b32encode
+from datetime import datetime, timezone
+from threading import Lock, local
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+SEGMENT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def normalize(url: str) -> str:
+    """The URL as requests will send it, so recording and replay agree."""
+    p = requests.PreparedRequest()
+    p.prepare_url(url, None)
+    return p.url
+
+
+def _digest(body: bytes) -> str:
+    return "sha1:" + b32encode(sha1(body).digest()).decode("ascii")
+
+
+class PageArchive:
+    def __init__(self, root: str):
+        import zstandard  # optional: only needed once pages are archived
+
+        self.root = root
+        self._lock = Lock()
+        # Compressor contexts are not thread-safe either: one per thread
+        self._local = local()
+        self._zstd = zstandard
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT, fetched_at REAL, segment TEXT, offset INTEGER, length INTEGER,"
+            " content_type TEXT, digest TEXT, partial INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        self._segment = None
+        self._fh = None
+
+    # ── Writing ──────────────────────────────────────────────────────────────
+
+    def _open_segment(self):
+        if self._fh is not None and self._fh.tell() < SEGMENT_MAX_BYTES:
+            return
+        if self._fh is not None:
+            self._fh.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        self._segment = f"pages-{stamp}-{os.getpid()}-{uuid.uuid4().hex[:6]}.warc.zst"
+        self._fh = open(os.path.join(self.root, self._segment), "ab")
+
+    def _record(self, url: str, body: bytes, content_type: str, digest: str, when: float) -> bytes:
+        date = datetime.fromtimestamp(when, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        head = (
+            "WARC/1.1\r\n"
+            "WARC-Type: resource\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Date: {date}\r\n"
+            f"WARC-Payload-Digest: {digest}\r\n"
+            f"Content-Type: {content_type or 'application/octet-stream'}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        return head.encode("utf-8") + body + b"\r\n\r\n"
+
+    def _compress(self, data: bytes) -> bytes:
+        cctx = getattr(self._local, "cctx", None)
+        if cctx is None:
+            cctx = self._local.cctx = self._zstd.ZstdCompressor(level=10)
+        return cctx.compress(data)
+
+    def _last(self, url: str):
+        return self._db.execute(
+            "SELECT segment, offset, length, digest FROM pages WHERE url=? "
+            "ORDER BY fetched_at DESC LIMIT 1", (url,),
+        ).fetchone()
+
+    def put(self, url: str, body: bytes, content_type: str = "", partial: bool = False):
+        url, when, digest = normalize(url), time.time(), _digest(body)
+        with self._lock:
+            last = self._last(url)
+        frame = None
+        if not (last and last[3] == digest):
+            # Compression is the slow part: other fetch threads keep archiving meanwhile
+            frame = self._compress(self._record(url, body, content_type, digest, when))
+        with self._lock:
+            if frame is not None:
+                last = self._last(url)
+            if last and last[3] == digest:
+                # Unchanged, or another thread archived the same bytes first
+                segment, offset, length = last[:3]
+            else:
+                self._open_segment()
+                segment, offset, length = self._segment, self._fh.tell(), len(frame)
+                self._fh.write(frame)
+                self._fh.flush()
+            self._db.execute(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, when, segment, offset, length, content_type, digest, int(partial)),
+            )
+            self._db.commit()
+
+    # ── Reading ──────────────────────────────────────────────────────────────
+
+    def get(self, url: str, before: float | None = None, since: float | None = None,
+            complete: bool = False):
+        """
+        Latest archived (body, content_type) for url, or None. before/since
+        bound the capture time; complete skips size-capped captures.
+        """
+        sql = "SELECT segment, offset, length, content_type FROM pages WHERE url=?"
+        args = [normalize(url)]
+        if before is not None:
+            sql += " AND fetched_at<=?"
+            args.append(before)
+        if since is not None:
+            sql += " AND fetched_at>=?"
+            args.append(since)
+        if complete:
+            sql += " AND partial=0"
+        with self._lock:
+            row = self._db.execute(sql + " ORDER BY fetched_at DESC LIMIT 1", args).fetchone()
+        if row is None:
+            return None
+        segment, offset, length, ctype = row
+        with open(os.path.join(self.root, segment), "rb") as fh:
+            fh.seek(offset)
+            # Decompressor contexts are not thread-safe: one per read
+            record = self._zstd.ZstdDecompressor().decompress(fh.read(length))
+        _, body = record.split(b"\r\n\r\n", 1)
+        return body[:-4], ctype
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class ArchiveAdapter(BaseAdapter):
+    """Transport that answers every request from a PageArchive (404 if absent)."""
+
+    def __init__(self, archive: PageArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        got = self.archive.get(request.url)
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url
+        if got is None:
+            resp.status_code, resp.reason, body = 404, "Not Archived", b""
+            resp.headers = CaseInsensitiveDict()
+        else:
+            body, ctype = got
+            resp.status_code, resp.reason = 200, "OK"
+            resp.headers = CaseInsensitiveDict({"Content-Type": ctype or "text/html"})
+        resp.raw = io.BytesIO(body)
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        return resp
+
+    def close(self):
+        pass
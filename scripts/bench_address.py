@@ -0,0 +1,88 @@
+"""
+Address extraction benchmark: the anchor-first scanner against the
+per-region regexes it replaced, on pages built to make the old
+patterns backtrack.
+
+Fails if the scanner's cost per character grows with page size (it
+must stay linear) or if it misses the address on the realistic page.
+
+    python scripts/bench_address.py
+    python scripts/bench_address.py --sizes 4000,16000,64000 --legacy-limit 30
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from scripts.extract import extract_address
+
+# The patterns ab_ministries and nt_ministries used before the scanner
+LEGACY = {
+    "AB": re.compile(
+        r"\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?)[^\n]{0,80}(?:AB|Alberta|Edmonton|Calgary)", re.I,
+    ),
+    "NT": re.compile(r"\d+\s+\w[\w\s,]+(?:Street|Ave|Avenue|Drive|Road|St\.?),?\s*\w[\w\s]*,?\s*NT", re.I),
+}
+ADDRESS = "Contact: 4920 52 Street, Yellowknife, NT X1A 3T1"
+
+PAGES = {
+    # Digits and words with no separator the old [\w\s,]+ runs stop at
+    "digit-word soup": lambda n: ("1 ministry 22 board 333 office " * (n // 31 + 1))[:n],
+    # Street suffixes everywhere, but never a locality after them
+    "suffix, no locality": lambda n: ("12 Main Street 3 Park Avenue " * (n // 29 + 1))[:n],
+    # Ordinary prose with the address at the very end
+    "realistic": lambda n: ("The department delivers programs and services. " * (n // 47 + 1))[:n] + " " + ADDRESS,
+}
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,3000,9000,27000", help="page sizes in characters")
+    parser.add_argument("--legacy-limit", type=float, default=0.5,
+                        help="stop timing a legacy pattern once one run takes this many seconds")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    ok = True
+    for label, make in PAGES.items():
+        print(f"{label}:")
+        per_char = []
+        slow = set()
+        for n in sizes:
+            text = make(n)
+            t_new = _time(lambda t: extract_address(t, "NT"), text, 5)
+            per_char.append(t_new / len(text))
+            cols = [f"scanner {t_new * 1000:8.2f} ms"]
+            for code, pat in LEGACY.items():
+                if code in slow:
+                    cols.append(f"{code} regex      skipped")
+                    continue
+                t_old = _time(pat.search, text, 1)
+                slow.update([code] if t_old > args.legacy_limit else [])
+                cols.append(f"{code} regex {t_old * 1000:9.2f} ms")
+            print(f"  {len(text):>7} chars  " + "  ".join(cols))
+        growth = per_char[-1] / per_char[0] if per_char[0] else 1.0
+        if growth > 3:
+            print(f"  [FAIL] scanner cost per char grew {growth:.1f}x from {sizes[0]} to {sizes[-1]} chars")
+            ok = False
+        if label == "realistic" and not extract_address(make(sizes[-1]), "NT"):
+            print("  [FAIL] scanner missed the address")
+            ok = False
+
+    print("[OK]" if ok else "[FAIL]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
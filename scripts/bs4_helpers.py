@@ -1,6 +1,11 @@
-import requests
+import sys
+from pathlib import Path
+
 from bs4 import BeautifulSoup
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from scripts.common import make_session, fetch_bytes
+
 def get_soup(source, parser="html.parser", from_url=True, headers=None):
     """
     Returns a BeautifulSoup object from a URL or raw HTML string.
@@ -9,7 +14,7 @@ def get_soup(source, parser="html.parser", from_url=True, headers=None):
         source (str): The URL or raw HTML content.
         parser (str): Parser to use ('html.parser', 'lxml', etc.)
         from_url (bool): If True, treats `source` as URL. If False, treats it as raw HTML.
-        headers (dict): Optional headers for requests.get().
+        headers (dict): Optional headers added to the shared session's.
     
     Returns:
         BeautifulSoup object
@@ -23,11 +28,13 @@ def get_soup(source, parser="html.parser", from_url=True, headers=None):
         
     """
     if from_url:
-        if headers is None:
-            headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(source, headers=headers)
-        response.raise_for_status()
-        html = response.text
+        # Through the shared fetch layer: archived, and replayed by --reextract
+        session = make_session()
+        session.headers.update(headers or {})
+        got = fetch_bytes(session, source)
+        if got is None:
+            raise RuntimeError(f"could not fetch {source}")
+        html = got[0]
     else:
         html = source
     
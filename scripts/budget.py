@@ -0,0 +1,105 @@
+"""
+Wall-clock budgets for a run and its regions.
+
+main.py opens a Budget for the whole run and a child Budget for every
+region; a child never outlives its parent. The current budget travels
+with the work through a context variable, so the fetch layer can clamp
+per-request timeouts to what is left and refuse new requests once it is
+spent. Worker threads do not inherit context variables: wrap their
+targets with carry().
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+_current: ContextVar["Budget | None"] = ContextVar("budget", default=None)
+
+
+class Budget:
+    def __init__(self, name: str, seconds: float | None = None, parent: "Budget | None" = None):
+        self.name = name
+        self.started = time.monotonic()
+        deadlines = [self.started + seconds] if seconds is not None else []
+        if parent is not None and parent.deadline is not None:
+            deadlines.append(parent.deadline)
+        self.deadline = min(deadlines) if deadlines else None
+        self.finished: float | None = None
+        self._lock = Lock()
+        self.fetched = 0
+        self.skipped = 0
+
+    def remaining(self) -> float | None:
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def expired(self) -> bool:
+        left = self.remaining()
+        return left is not None and left <= 0
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def note(self, fetched: int = 0, skipped: int = 0):
+        with self._lock:
+            self.fetched += fetched
+            self.skipped += skipped
+
+    def report(self) -> dict:
+        total = self.fetched + self.skipped
+        return {
+            "name": self.name,
+            "elapsed": round(self.elapsed(), 1),
+            "ran_out": self.deadline is not None and self.started + self.elapsed() >= self.deadline,
+            "fetched": self.fetched,
+            "skipped": self.skipped,
+            "completeness": round(self.fetched / total, 3) if total else 1.0,
+        }
+
+
+def current() -> Budget | None:
+    return _current.get()
+
+
+@contextmanager
+def scope(budget: Budget):
+    """Make budget the current one for this thread's work."""
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
+
+
+def carry(fn):
+    """Bind fn to the caller's budget, for running on another thread."""
+    budget = _current.get()
+    if budget is None:
+        return fn
+
+    def run(*args, **kwargs):
+        with scope(budget):
+            return fn(*args, **kwargs)
+    return run
+
+
+def expired() -> bool:
+    budget = _current.get()
+    return budget is not None and budget.expired()
+
+
+def clamp(timeout: float) -> float:
+    """timeout, cut down to what is left of the current budget (may be <= 0)."""
+    budget = _current.get()
+    left = budget.remaining() if budget is not None else None
+    return timeout if left is None else min(timeout, left)
+
+
+def note(fetched: int = 0, skipped: int = 0):
+    budget = _current.get()
+    if budget is not None:
+        budget.note(fetched, skipped)
@@ -0,0 +1,49 @@
+"""
+Contact scanner check: known page fragments must yield the expected
+phone, email, address and social fields.
+
+Covers the cases the one-pass scanner has got wrong before: emails whose
+local part starts with a street suffix, x.com inside other hosts, and
+phone numbers cut out of longer digit runs.
+
+    python scripts/check_contacts.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from bs4 import BeautifulSoup
+from scripts.extract import scan_contacts
+
+# (html, province, {field: expected}); fields not listed are not checked
+CASES = [
+    ("<p>Write to road.safety@gov.ab.ca today</p>", "AB", {"email": "road.safety@gov.ab.ca"}),
+    ("<p>Write to st.johns.office@gov.nl.ca today</p>", "NL", {"email": "st.johns.office@gov.nl.ca"}),
+    ("<p>Write to drive-clean@gov.bc.ca today</p>", "BC", {"email": "drive-clean@gov.bc.ca"}),
+    ("<p>Write to street.team@toronto.ca today</p>", "ON", {"email": "street.team@toronto.ca"}),
+    ("<p>Avenue.info@gov.sk.ca or 306-555-0101</p>", "SK",
+     {"email": "Avenue.info@gov.sk.ca", "phone": "306-555-0101"}),
+    ("<p>Office: 4920 52 Street, Yellowknife, NT X1A 3T1. Email info@gov.nt.ca</p>", "NT",
+     {"address": "4920 52 Street, Yellowknife, NT X1A 3T1", "email": "info@gov.nt.ca"}),
+    ("<p>Ref 12345678901234. Call (867) 555-0101</p>", None, {"phone": "(867) 555-0101"}),
+    ('<a href="https://box.com/a">box</a><a href="https://x.com/gnwt">X</a>', None,
+     {"twitter": "https://x.com/gnwt"}),
+    ('<a href="mailto:info@gov.nt.ca?subject=hi">mail</a><p>other@gov.nt.ca</p>', None,
+     {"email": "info@gov.nt.ca"}),
+]
+
+
+def main() -> int:
+    ok = True
+    for html, province, expected in CASES:
+        found = scan_contacts(BeautifulSoup(html, "lxml"), province)
+        for field, want in expected.items():
+            if found[field] != want:
+                print(f"[FAIL] {field}: got {found[field]!r}, want {want!r} in {html!r}")
+                ok = False
+    print("[OK]" if ok else "[FAIL]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
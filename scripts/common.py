@@ -1,11 +1,19 @@
-import re
 import os
 import csv
+import time
+from contextlib import contextmanager, nullcontext
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, parse_qs, unquote, urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Semaphore, Lock
+from urllib.parse import urlparse, parse_qs, unquote, urljoin, urldefrag
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from threading import Semaphore, Lock, Event
+from urllib3.exceptions import NewConnectionError
+
+from scripts import budget, seeds
+from scripts.extract import PHONE_RE, EMAIL_RE, extract_contacts
+from scripts.fetch import (
+    SingleFlight, LRUMemo, EncodingResolver, CircuitBreaker, CanonicalUrls,
+    LatencyTracker, HedgeBudget, backoff_delay, retry_after_seconds,
+)
 
 HEADERS = {
     "User-Agent": (
@@ -15,9 +23,6 @@ HEADERS = {
     )
 }
 
-PHONE_RE = re.compile(r'(?:(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})')
-EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
-
 MINISTRY_FIELDS = [
     "province", "type", "name", "about", "priorities",
     "website", "phone", "email", "address",
@@ -32,22 +37,170 @@ AGENCY_FIELDS = [
     "parent_ministry",
 ]
 
+# On-disk caches that outlive a run (sitemaps, ...); safe to delete
+CACHE_DIR = os.environ.get("AGENCY_CACHE_DIR", ".cache")
+
 # ── Rate limiting ────────────────────────────────────────────────────────────
 # Max concurrent requests per domain (avoids hammering a single gov site)
 _DOM_LIMIT = 5
+# Hedged duplicates (--hedge) have slots of their own on top of those
+_HEDGE_LIMIT = 1
 _dom_lock = Lock()
 _dom_sems: dict[str, Semaphore] = {}
+_hedge_sems: dict[str, Semaphore] = {}
 
 # Max concurrent DuckDuckGo searches globally
 DDG_SEM = Semaphore(2)
 
 
-def _dom_sem(url: str) -> Semaphore:
+def _slot(sems: dict, limit: int, url: str) -> Semaphore:
     domain = urlparse(url).netloc
     with _dom_lock:
-        if domain not in _dom_sems:
-            _dom_sems[domain] = Semaphore(_DOM_LIMIT)
-        return _dom_sems[domain]
+        if domain not in sems:
+            sems[domain] = Semaphore(limit)
+        return sems[domain]
+
+
+def _dom_sem(url: str) -> Semaphore:
+    return _slot(_dom_sems, _DOM_LIMIT, url)
+
+
+def _hedge_sem(url: str) -> Semaphore:
+    return _slot(_hedge_sems, _HEDGE_LIMIT, url)
+
+
+# ── Request coalescing / per-run memo ────────────────────────────────────────
+# Concurrent get_soup calls for one URL share a single in-flight fetch, and
+# parsed documents are kept for the rest of the run (shared contact pages,
+# index pages used by several regions). Memoized trees are shared between
+# callers, so treat them as read-only. fetch_bytes keeps raw bodies the
+# same way for the streaming pipeline, whose trees are private.
+# A parsed tree costs roughly this many times its HTML size in memory.
+_SOUP_OVERHEAD = 8
+MEMO_MAX_BYTES = 512 * 1024 * 1024
+BYTES_MEMO_MAX_BYTES = 128 * 1024 * 1024
+_flight = SingleFlight()
+_memo = LRUMemo(MEMO_MAX_BYTES)
+_bytes_memo = LRUMemo(BYTES_MEMO_MAX_BYTES)
+_encodings = EncodingResolver()
+
+
+def reset_memo():
+    """Drop every memoized document (start of a new run)."""
+    _memo.clear()
+    _bytes_memo.clear()
+
+
+# ── Retries / circuit breaker ────────────────────────────────────────────────
+# Timeouts, dropped connections, 429 and 5xx are retried with jittered
+# exponential backoff (Retry-After is honoured). A domain that fails
+# BREAKER_THRESHOLD times in a row is skipped outright for
+# BREAKER_COOLDOWN seconds, then one request probes whether it is back.
+RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 10.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60.0
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+_breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+# ── Redirect / dead-link memory ──────────────────────────────────────────────
+# Kept across runs: permanent redirects send the next request straight to
+# the final URL, and a URL that failed hard (404/410, or a DNS failure or
+# refused connection on every retry) in DEAD_AFTER separate runs is skipped
+# until DEAD_TTL ends. Timeouts and 5xx never count: the host is there.
+REDIRECT_TTL = 30 * 24 * 3600
+DEAD_TTL = 7 * 24 * 3600
+DEAD_AFTER = 2
+_DEAD_STATUS = {404, 410}
+_canon = CanonicalUrls(os.path.join(CACHE_DIR, "urls.sqlite"), REDIRECT_TTL, DEAD_TTL, DEAD_AFTER)
+
+# ── Hedging ──────────────────────────────────────────────────────────────────
+# Off by default (main.py --hedge). Once a domain has enough history, a
+# request still running after that domain's p95 latency gets a duplicate
+# and whichever answers first is used, within HEDGE_RATIO extra requests
+# and at most _HEDGE_LIMIT duplicates in flight per domain.
+HEDGE = False
+HEDGE_RATIO = 0.05
+HEDGE_QUANTILE = 0.95
+_latency = LatencyTracker()
+_hedge_budget = HedgeBudget(HEDGE_RATIO)
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+def use_hedging(enabled: bool = True, ratio: float = HEDGE_RATIO):
+    global HEDGE
+    HEDGE = enabled
+    _hedge_budget.ratio = ratio
+
+
+def hedge_stats() -> dict:
+    b = _hedge_budget
+    return {"requests": b.requests, "hedges": b.hedges, "wins": b.wins}
+
+
+# ── Page archive ─────────────────────────────────────────────────────────────
+# Every fetched page is appended to a zstd-compressed archive (see
+# scripts/archive.py). In replay mode (main.py --reextract) sessions are
+# served from it instead of the network.
+ARCHIVE = True
+REPLAY = False
+# Set by use_archive_cache(): pages archived this recently are not refetched
+ARCHIVE_MAX_AGE: float | None = None
+ARCHIVE_DIR = os.environ.get("AGENCY_ARCHIVE_DIR", "archive")
+_archive = None
+_archive_lock = Lock()
+
+
+def _page_archive():
+    global _archive, ARCHIVE
+    with _archive_lock:
+        if _archive is None and ARCHIVE:
+            try:
+                from scripts.archive import PageArchive
+                _archive = PageArchive(ARCHIVE_DIR)
+            except ImportError as e:
+                print(f"[WARN] page archive disabled: {e}")
+                ARCHIVE = False
+        return _archive
+
+
+def archive_page(url: str, body: bytes, content_type: str = "", partial: bool = False):
+    if ARCHIVE and not REPLAY:
+        archive = _page_archive()
+        if archive is not None:
+            archive.put(url, body, content_type, partial)
+
+
+def use_archive_cache(max_age: float):
+    """Serve pages archived less than max_age seconds ago without refetching."""
+    global ARCHIVE_MAX_AGE
+    if _page_archive() is None:
+        raise RuntimeError("the archive cache needs the page archive (pip install zstandard)")
+    ARCHIVE_MAX_AGE = max_age
+
+
+def _from_archive(url: str, stream: bool, max_bytes: int | None):
+    """A fresh enough archived copy of url, as (body, content_type), or None."""
+    archive = _page_archive() if ARCHIVE_MAX_AGE else None
+    if archive is None:
+        return None
+    got = archive.get(url, since=time.time() - ARCHIVE_MAX_AGE,
+                      complete=not (stream and max_bytes))
+    if got is None or (stream and not _html_type(got[1])):
+        return None
+    body, ctype = got
+    if stream and max_bytes:
+        body = body[:max_bytes]
+    return body, ctype
+
+
+def use_archive_replay():
+    """Serve every session from the archive: no network at all."""
+    global REPLAY
+    if _page_archive() is None:
+        raise RuntimeError("--reextract needs the page archive (pip install zstandard)")
+    REPLAY = True
 
 
 # ── HTTP helpers ─────────────────────────────────────────────────────────────
@@ -55,41 +208,412 @@ def _dom_sem(url: str) -> Semaphore:
 def make_session() -> requests.Session:
     s = requests.Session()
     s.headers.update(HEADERS)
+    if REPLAY:
+        from scripts.archive import ArchiveAdapter
+        adapter = ArchiveAdapter(_page_archive())
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
     return s
 
 
-def get_soup(session: requests.Session, url: str, timeout: int = 15):
-    with _dom_sem(url):
-        try:
+# Cap for enrichment fetches of arbitrary external sites
+ENRICH_MAX_BYTES = 1024 * 1024
+
+
+def _html_type(ctype: str) -> bool:
+    ctype = (ctype or "").lower()
+    return not ctype or "html" in ctype or "xml" in ctype
+
+
+def _is_html(resp) -> bool:
+    return _html_type(resp.headers.get("Content-Type", ""))
+
+
+def _read_capped(resp, max_bytes: int | None) -> bytes:
+    """Read a streamed body, stopping at max_bytes."""
+    buf = bytearray()
+    for chunk in resp.iter_content(16384):
+        buf += chunk
+        if max_bytes and len(buf) >= max_bytes:
+            del buf[max_bytes:]
+            break
+    return bytes(buf)
+
+
+def resolve_encoding(url: str, content_type: str, body: bytes) -> str | None:
+    """Encoding from headers, <meta charset> or the domain's last known one."""
+    return _encodings.resolve(urlparse(url).netloc, content_type, body)
+
+
+def parse_html(body: bytes, url: str, content_type: str = "", encoding: str | None = None):
+    """
+    Parse raw response bytes. The encoding comes from the override, the
+    headers, <meta charset> or what the domain used before; charset
+    detection only runs when none of those are known.
+    """
+    from bs4 import BeautifulSoup  # deferred: keeps region start-up fast
+
+    enc = encoding or resolve_encoding(url, content_type, body)
+    soup = BeautifulSoup(body, "html.parser", from_encoding=enc)
+    if not enc:
+        _encodings.learn(urlparse(url).netloc, soup.original_encoding)
+    return soup
+
+
+def _fetch_once(session: requests.Session, url: str, timeout: int, stream: bool,
+                max_bytes: int | None, slot: bool = True, started: Event | None = None):
+    """
+    One attempt; raises on network and HTTP errors, None for non-HTML.
+    Latency is timed from when the domain slot is held, so it measures the
+    host rather than our own queue. slot=False when the caller already
+    holds a slot for this request (see _fetch_hedged).
+    started is set once the request is actually going out.
+    """
+    with _dom_sem(url) if slot else nullcontext():
+        if started is not None:
+            started.set()
+        t0 = time.perf_counter()
+        if stream:
+            with session.get(url, timeout=timeout, stream=True) as resp:
+                resp.raise_for_status()
+                if not _is_html(resp):
+                    print(f"[SKIP] {url}: not HTML ({resp.headers.get('Content-Type')})")
+                    return None
+                body = _read_capped(resp, max_bytes)
+        else:
             resp = session.get(url, timeout=timeout)
             resp.raise_for_status()
-            return BeautifulSoup(resp.text, "html.parser")
-        except Exception as e:
-            print(f"[WARN] {url}: {e}")
+            body = resp.content
+        _latency.record(urlparse(url).netloc, time.perf_counter() - t0)
+    _note_redirects(url, resp)
+    return body, resp.headers.get("Content-Type", "")
+
+
+def _note_redirects(url: str, resp):
+    """Remember the permanent hops of a redirect chain for next time."""
+    if REPLAY or not resp.history:
+        return
+    chain = resp.history + [resp]
+    for i, hop in enumerate(resp.history):
+        if hop.status_code in (301, 308):
+            src = url if i == 0 else hop.url
+            _canon.redirect(urldefrag(src)[0], urldefrag(chain[i + 1].url)[0])
+
+
+def _in_slot(sem: Semaphore, fn, *args, **kwargs):
+    """fn(*args, **kwargs), then release the slot the caller acquired for it."""
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        sem.release()
+
+
+def _fetch_hedged(session, url, timeout, stream, max_bytes):
+    """_fetch_once, plus a duplicate request if the first one runs long."""
+    args = (session, url, timeout, stream, max_bytes)
+    delay = _latency.quantile(urlparse(url).netloc, HEDGE_QUANTILE) if HEDGE else None
+    if delay is None:
+        return _fetch_once(*args)
+    _hedge_budget.request()
+    # The domain slot is taken here, on the calling thread: pool workers
+    # never sit queued behind one slow domain while others wait for them
+    sem = _dom_sem(url)
+    sem.acquire()
+    started = Event()
+    first = _HEDGE_POOL.submit(_in_slot, sem, _fetch_once, *args, slot=False, started=started)
+    # The delay counts from when the request leaves, not from the pool queue
+    if not started.wait(budget.clamp(timeout)) and first.cancel():
+        # No pool worker came free in time: go out from this thread instead
+        return _in_slot(sem, _fetch_once, *args, slot=False)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    # A duplicate never queues: it goes out only if the domain's hedge
+    # slot is free and the run still has hedge budget
+    hedge_sem = _hedge_sem(url)
+    if not hedge_sem.acquire(blocking=False):
+        return first.result()
+    if not _hedge_budget.spend():
+        hedge_sem.release()
+        return first.result()
+    hedge = _HEDGE_POOL.submit(_in_slot, hedge_sem, _fetch_once, *args, slot=False)
+    pending = {first, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                # The slower request finishes in the background and is dropped
+                if fut is hedge:
+                    _hedge_budget.won()
+                return fut.result()
+    return first.result()  # both failed: surface the original error
+
+
+def _transient(e: Exception) -> bool:
+    if isinstance(e, requests.HTTPError):
+        return e.response is not None and e.response.status_code in _RETRY_STATUS
+    return isinstance(e, (requests.ConnectionError, requests.Timeout,
+                          requests.exceptions.ChunkedEncodingError))
+
+
+def _unreachable(e: Exception) -> bool:
+    """DNS failure or connection refused: nothing is listening at all."""
+    if not isinstance(e, requests.ConnectionError) or isinstance(e, requests.Timeout):
+        return False
+    reason = getattr(e.args[0], "reason", None) if e.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _fetch_body(session: requests.Session, url: str, timeout: int, stream: bool = False,
+                max_bytes: int | None = None):
+    """Return (body, content_type), or None on failure."""
+    cached = _from_archive(url, stream, max_bytes) if not REPLAY else None
+    if cached is not None:
+        return cached
+    # Replay looks pages up under the URL they were requested with
+    target, dead = (url, False) if REPLAY else _canon.resolve(url)
+    if dead:
+        print(f"[SKIP] {url}: known dead link")
+        return None
+    domain = urlparse(target).netloc
+    for attempt in range(RETRIES + 1):
+        # Never wait past the current region's budget
+        left = budget.clamp(timeout)
+        if left <= 0:
+            print(f"[SKIP] {url}: time budget spent")
+            budget.note(skipped=1)
             return None
+        if not _breaker.allow(domain):
+            print(f"[SKIP] {url}: {domain} is failing, circuit open")
+            return None
+        try:
+            got = _fetch_hedged(session, target, left, stream, max_bytes)
+        except Exception as e:
+            if not _transient(e):
+                # The host answered (404, bad content...): nothing to retry
+                _breaker.success(domain)
+                budget.note(fetched=1)
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status in _DEAD_STATUS and not REPLAY:
+                    _canon.failure(url)
+                print(f"[WARN] {url}: {e}")
+                return None
+            clamped = left < timeout and isinstance(e, requests.Timeout)
+            if clamped:
+                # Cut short by our own budget, not the host's fault
+                _breaker.release(domain)
+            else:
+                _breaker.failure(domain)
+            resp = getattr(e, "response", None)
+            retry_after = retry_after_seconds(resp.headers.get("Retry-After")) if resp is not None else None
+            delay = backoff_delay(attempt, BACKOFF_BASE, BACKOFF_CAP, retry_after)
+            if attempt == RETRIES:
+                print(f"[WARN] {url}: {e} (gave up after {attempt + 1} attempts)")
+                budget.note(fetched=1)
+                if not REPLAY and not clamped and _unreachable(e):
+                    _canon.failure(url)
+                return None
+            if budget.clamp(delay) < delay:
+                print(f"[WARN] {url}: {e} (no time left to retry)")
+                budget.note(fetched=1)
+                return None
+            # Sleep outside the domain slot so other requests can use it
+            time.sleep(delay)
+            continue
+        _breaker.success(domain)
+        budget.note(fetched=1)
+        if not REPLAY:
+            _canon.success(url)
+        if got is not None:
+            body = got[0]
+            archive_page(url, body, got[1],
+                         partial=stream and bool(max_bytes and len(body) >= max_bytes))
+        return got
+
+
+def _fetch_soup(session: requests.Session, url: str, key: str, soup_key: str, timeout: int,
+                encoding: str | None, **fetch_kwargs):
+    soup = _memo.get(soup_key)
+    if soup is not None:
+        return soup
+    # Raw bytes may already be here (fetch_bytes callers, warm.py)
+    got = _bytes_memo.get(url) or _bytes_memo.get(key) or _fetch_body(session, url, timeout, **fetch_kwargs)
+    if got is None:
+        return None
+    # Parsing happens outside the domain slot so the next request can start
+    body, ctype = got
+    soup = parse_html(body, url, ctype, encoding)
+    _memo.put(soup_key, soup, len(body) * _SOUP_OVERHEAD)
+    return soup
+
+
+def _memo_key(url: str, stream: bool, max_bytes: int | None) -> str:
+    if not stream:
+        return url
+    # Partial documents are memoized separately from the full page
+    return f"{url}#cap={max_bytes}"
+
+
+def get_soup(session: requests.Session, url: str, timeout: int = 15, encoding: str | None = None,
+             stream: bool = False, max_bytes: int | None = None):
+    """
+    Fetch and parse url, or return None on failure.
+    encoding overrides whatever the response headers declare.
+
+    stream=True reads the body incrementally: non-HTML responses (PDFs,
+    images) are rejected from the headers alone, reading stops after
+    max_bytes, and only what was read gets parsed.
+
+    The tree is memoized for the rest of the run and shared with every
+    other caller of the same URL (and encoding): treat it as read-only,
+    and copy.copy() any part you need to edit.
+    """
+    url = urldefrag(url)[0]
+    # A tree decoded with an override is kept apart from the default one
+    enc = f"|enc={encoding.lower()}" if encoding else ""
+    soup = _memo.get(url + enc)
+    if soup is not None:
+        return soup
+    key = _memo_key(url, stream, max_bytes)
+    soup = _memo.get(key + enc)
+    if soup is not None:
+        return soup
+    return _flight.do(key + enc, lambda: _fetch_soup(
+        session, url, key, key + enc, timeout, encoding,
+        stream=stream, max_bytes=max_bytes,
+    ))
+
+
+def fetch_bytes(session: requests.Session, url: str, timeout: int = 15, stream: bool = False,
+                max_bytes: int | None = None):
+    """
+    Fetch url without parsing it: (body, content_type), or None on failure.
+    Same options and request coalescing as get_soup.
+    """
+    url = urldefrag(url)[0]
+    got = _bytes_memo.get(url)
+    if got is not None:
+        return got
+    key = _memo_key(url, stream, max_bytes)
+    got = _bytes_memo.get(key)
+    if got is not None:
+        return got
+
+    def fetch():
+        got = _fetch_body(session, url, timeout, stream=stream, max_bytes=max_bytes)
+        if got is not None:
+            _bytes_memo.put(key, got, len(got[0]))
+        return got
+
+    return _flight.do("bytes:" + key, fetch)
+
+
+def keep_bytes(url: str, body: bytes, content_type: str = ""):
+    """Hand a complete body read some other way (a streamed probe) to fetch_bytes."""
+    _bytes_memo.put(urldefrag(url)[0], (body, content_type), len(body))
+
+
+@contextmanager
+def streamed_get(session: requests.Session, url: str, timeout: int = 15):
+    """
+    One streamed GET for callers that read (and may abandon) the body
+    themselves, under the same domain slot, circuit breaker, dead-link
+    memory and time budget as fetch_bytes, but with no retries. Yields
+    the open response, or None when the request is skipped.
+    """
+    target, dead = (url, False) if REPLAY else _canon.resolve(url)
+    domain = urlparse(target).netloc
+    left = budget.clamp(timeout)
+    if dead or left <= 0 or not _breaker.allow(domain):
+        yield None
+        return
+    with _dom_sem(target):
+        try:
+            resp = session.get(target, timeout=left, stream=True)
+        except Exception:
+            budget.note(fetched=1)
+            if left < timeout:
+                # Possibly cut short by our own budget, not the host's fault
+                _breaker.release(domain)
+            else:
+                _breaker.failure(domain)
+            raise
+        # Any answer, 404 included, means the host is up
+        _breaker.success(domain)
+        budget.note(fetched=1)
+        if not REPLAY:
+            if resp.status_code in _DEAD_STATUS:
+                _canon.failure(url)
+            elif resp.ok:
+                _canon.success(url)
+        with resp:
+            yield resp
+
 
+def _acquire(sem: Semaphore, cancel: Event | None) -> bool:
+    """Block on sem, giving up early if cancel gets set while queued."""
+    if cancel is None:
+        sem.acquire()
+        return True
+    while not sem.acquire(timeout=0.1):
+        if cancel.is_set():
+            return False
+    if cancel.is_set():
+        sem.release()
+        return False
+    return True
 
-def duckduckgo(query: str, session=None) -> str:
+
+def duckduckgo(query: str, session=None, cancel: Event | None = None) -> str:
+    """
+    Return the top DuckDuckGo result for query, or "".
+    If cancel is set while the search is still queued behind DDG_SEM,
+    the search is abandoned without touching the network.
+    """
     if session is None:
         session = make_session()
-    with DDG_SEM:
-        try:
-            r = session.get(
-                "https://duckduckgo.com/html/",
-                params={"q": query},
-                timeout=10,
-            )
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            a = soup.select_one("a.result__a")
-            if not a:
-                return ""
-            parsed = urlparse(a["href"])
-            qs = parse_qs(parsed.query)
-            return unquote(qs["uddg"][0]) if "uddg" in qs else a["href"]
-        except Exception as e:
-            print(f"[DDG] {query}: {e}")
+    if budget.expired():
+        budget.note(skipped=1)
+        return ""
+    if not _acquire(DDG_SEM, cancel):
+        return ""
+    try:
+        r = session.get(
+            "https://duckduckgo.com/html/",
+            params={"q": query},
+            timeout=max(0.1, budget.clamp(10)),
+        )
+        r.raise_for_status()
+        archive_page(r.url, r.content, r.headers.get("Content-Type", ""))
+        soup = parse_html(r.content, r.url, r.headers.get("Content-Type", ""))
+        a = soup.select_one("a.result__a")
+        if not a:
             return ""
+        parsed = urlparse(a["href"])
+        qs = parse_qs(parsed.query)
+        return unquote(qs["uddg"][0]) if "uddg" in qs else a["href"]
+    except Exception as e:
+        print(f"[DDG] {query}: {e}")
+        return ""
+    finally:
+        DDG_SEM.release()
+
+
+def find_website(session, row: dict, query: str) -> str:
+    """
+    row's website: as scraped, else from the seed registry, else the top
+    search hit for query. Only a scraped website is recorded in the
+    registry: nothing here checks that a search hit is the entity's page.
+    """
+    reg = seeds.registry()
+    scraped = row["website"].startswith("http")
+    if not row["website"]:
+        row["website"] = reg.website(row["province"], row["name"])
+    if not row["website"]:
+        row["website"] = duckduckgo(query, session) or ""
+    if scraped:
+        reg.remember(row["province"], row["name"], row["website"], row["type"], row["parent_ministry"])
+    return row["website"] if row["website"].startswith("http") else ""
 
 
 # ── Extraction helpers ───────────────────────────────────────────────────────
@@ -104,22 +628,25 @@ def extract_email(text: str) -> str:
     return m.group(0).strip() if m else ""
 
 
-def extract_socials(soup) -> dict:
-    out = {"twitter": "", "facebook": "", "youtube": "", "instagram": ""}
-    if not soup:
-        return out
-    patterns = {
-        "twitter":   r"(?:twitter|x)\.com/",
-        "facebook":  r"facebook\.com/",
-        "youtube":   r"youtube\.com/",
-        "instagram": r"instagram\.com/",
-    }
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        for p, pat in patterns.items():
-            if not out[p] and re.search(pat, href, re.I):
-                out[p] = href
-    return out
+def extract_agency_page(soup, row: dict) -> dict:
+    """Fill phone, email and description of an agency row from its website."""
+    if soup is None:
+        return row
+    row.update(extract_contacts(soup))
+    for p in soup.find_all("p"):
+        t = p.get_text(strip=True)
+        if len(t) > 60:
+            row["description"] = t
+            break
+    return row
+
+
+def scrape_minister_contact(soup, row: dict) -> dict:
+    """FollowUp step: minister phone and email of a ministry row from its contact page."""
+    if soup:
+        c = extract_contacts(soup)
+        row["minister_phone"], row["minister_email"] = c["phone"], c["email"]
+    return row
 
 
 # ── I/O helpers ──────────────────────────────────────────────────────────────
@@ -132,6 +659,32 @@ def open_writer(filepath: str, fields: list):
     return f, w
 
 
+# ── Timing helpers ───────────────────────────────────────────────────────────
+
+def _percentile(sorted_vals: list, q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))
+    return sorted_vals[i]
+
+
+def report_latencies(tag: str, samples: list) -> dict:
+    """Print and return a p50/p90/p99/max summary of per-entity seconds."""
+    vals = sorted(samples)
+    stats = {
+        "n": len(vals),
+        "p50": _percentile(vals, 0.50),
+        "p90": _percentile(vals, 0.90),
+        "p99": _percentile(vals, 0.99),
+        "max": vals[-1] if vals else 0.0,
+    }
+    print(
+        f"{tag} latency n={stats['n']} p50={stats['p50']:.2f}s "
+        f"p90={stats['p90']:.2f}s p99={stats['p99']:.2f}s max={stats['max']:.2f}s"
+    )
+    return stats
+
+
 # ── Concurrency helper ───────────────────────────────────────────────────────
 
 def parallel_scrape(session, items, worker_fn, max_workers: int = 8) -> list:
@@ -144,6 +697,7 @@ def parallel_scrape(session, items, worker_fn, max_workers: int = 8) -> list:
     n = min(max_workers, len(items))
     results = []
     with ThreadPoolExecutor(max_workers=n) as ex:
+        worker_fn = budget.carry(worker_fn)
         futs = {ex.submit(worker_fn, session, item): item for item in items}
         for fut in as_completed(futs):
             try:
@@ -153,3 +707,26 @@ def parallel_scrape(session, items, worker_fn, max_workers: int = 8) -> list:
             except Exception as e:
                 print(f"[WARN] worker failed: {e}")
     return results
+
+
+def parallel_imap(session, items, worker_fn, max_workers: int = 8):
+    """
+    Like parallel_scrape, but a generator that yields results in input
+    order as soon as each one (and everything before it) has finished,
+    so callers can stream rows to disk while later items are in flight.
+    """
+    items = list(items)
+    if not items:
+        return
+    n = min(max_workers, len(items))
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        worker_fn = budget.carry(worker_fn)
+        futs = [ex.submit(worker_fn, session, item) for item in items]
+        for fut in futs:
+            try:
+                r = fut.result()
+            except Exception as e:
+                print(f"[WARN] worker failed: {e}")
+                continue
+            if r is not None:
+                yield r
@@ -0,0 +1,358 @@
+"""
+Contact extraction from parsed pages, structured data first.
+
+Government pages usually say who to call in a machine-readable way
+already: tel:/mailto: links, schema.org JSON-LD (Organization,
+GovernmentOrganization, ...), microdata itemprops, or contact meta
+tags. Those are collected in one walk over the tree and read first; the page's
+flattened text is only scanned for what they leave empty, so the number
+found is the one the page marks as its contact rather than the first
+ten-digit run in the text.
+
+scan_contacts() fills every contact field of a page (phone, email,
+address, socials) with one pass over its links and at most one pass
+over its text; with candidates=True it also returns everything it saw,
+with positions, for callers that want to rank the alternatives.
+"""
+import re
+import json
+from typing import NamedTuple
+from urllib.parse import unquote
+
+PHONE_RE = re.compile(r'(?:(?:\+?1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})')
+# Only starts where a run of address characters starts, so a long run
+# without an @ is walked once instead of once per position
+EMAIL_RE = re.compile(r'(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+SOCIAL_FIELDS = ("twitter", "facebook", "youtube", "instagram")
+
+# One search per link: contact schemes at the start, social hosts anywhere
+_LINK_RE = re.compile(
+    r"^(?P<tel>tel:)|^(?P<mailto>mailto:)"
+    r"|(?<![\w-])(?P<twitter>(?:twitter|x)\.com/)"
+    r"|(?P<facebook>facebook\.com/)|(?P<youtube>youtube\.com/)|(?P<instagram>instagram\.com/)",
+    re.I,
+)
+
+# itemprop (and meta name=) values that carry a contact field
+_MICRODATA = {"telephone": "phone", "email": "email"}
+# og:/business: meta properties, matched on the lowercased attribute
+_META_SUFFIXES = (("phone_number", "phone"), (":email", "email"))
+
+
+def _phone(value: str) -> str:
+    m = PHONE_RE.search(value or "")
+    return m.group(0).strip() if m else ""
+
+
+def _email(value: str) -> str:
+    m = EMAIL_RE.search(unquote(value or ""))
+    return m.group(0).strip() if m else ""
+
+
+class Candidate(NamedTuple):
+    """
+    One value seen for a field. source is "json-ld", "link", "microdata",
+    "meta" or "text"; start/end are offsets into the text for "text", the
+    link's index among the page's links for "link", and -1 otherwise.
+    """
+    field: str
+    value: str
+    source: str
+    start: int = -1
+    end: int = -1
+
+
+def _offer(out: dict, cands: list | None, field: str, value: str, source: str,
+           start: int = -1, end: int = -1):
+    """First value wins the field; every value is kept as a candidate."""
+    if not value:
+        return
+    if not out.get(field):
+        out[field] = value
+    if cands is not None:
+        cands.append(Candidate(field, value, source, start, end))
+
+
+# ── Structured sources ───────────────────────────────────────────────────────
+
+def _ld_nodes(data):
+    """Every dict in a JSON-LD document, @graph and nested contactPoints included."""
+    if isinstance(data, list):
+        for d in data:
+            yield from _ld_nodes(d)
+    elif isinstance(data, dict):
+        yield data
+        for v in data.values():
+            if isinstance(v, (dict, list)):
+                yield from _ld_nodes(v)
+
+
+def _from_json_ld(scripts, out: dict, cands=None):
+    for script in scripts:
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        for node in _ld_nodes(data):
+            _offer(out, cands, "phone", _phone(str(node.get("telephone") or "")), "json-ld")
+            _offer(out, cands, "email", _email(str(node.get("email") or "")), "json-ld")
+            if cands is None and out["phone"] and out["email"]:
+                return
+
+
+def _from_links(anchors, out: dict, cands=None):
+    """tel:, mailto: and social profile links, one regex search per link."""
+    for i, a in enumerate(anchors):
+        href = a["href"].strip()
+        m = _LINK_RE.search(href)
+        if m is None:
+            continue
+        field = m.lastgroup
+        if field == "tel":
+            # The visible text keeps the page's formatting; the href is the fallback
+            value = _phone(a.get_text(" ", strip=True)) or _phone(unquote(href[4:]))
+            field = "phone"
+        elif field == "mailto":
+            value, field = _email(href[7:].split("?")[0]), "email"
+        else:
+            value = href
+        _offer(out, cands, field, value, "link", i, i + 1)
+
+
+def _from_tags(tags, source: str, out: dict, cands=None):
+    """(field, tag) pairs from microdata or meta tags; content= wins over text."""
+    for field, tag in tags:
+        if out[field] and cands is None:
+            continue
+        value = tag.get("content") or ("" if source == "meta" else tag.get_text(" ", strip=True))
+        _offer(out, cands, field, _phone(value) if field == "phone" else _email(value), source)
+
+
+def _meta_field(attrs: dict) -> str:
+    if attrs.get("itemprop") in _MICRODATA:
+        return _MICRODATA[attrs["itemprop"]]
+    for key in ("property", "name"):
+        value = (attrs.get(key) or "").lower()
+        if key == "name" and value in _MICRODATA:
+            return _MICRODATA[value]
+        for suffix, field in _META_SUFFIXES:
+            if value.endswith(suffix):
+                return field
+    return ""
+
+
+def _contact_tags(soup):
+    """
+    One walk over the tree, bucketing what the structured readers need:
+    JSON-LD scripts, links, microdata (field, tag) and meta (field, tag).
+    """
+    ld, anchors, micro, meta = [], [], [], []
+    for tag in soup.find_all(True):
+        name, attrs = tag.name, tag.attrs
+        if name == "meta":
+            field = _meta_field(attrs)
+            if field:
+                meta.append((field, tag))
+            continue
+        if name == "a" and attrs.get("href") is not None:
+            anchors.append(tag)
+        elif name == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            ld.append(tag)
+        if attrs.get("itemprop") in _MICRODATA:
+            micro.append((_MICRODATA[attrs["itemprop"]], tag))
+    return ld, anchors, micro, meta
+
+
+def _structured(soup, out: dict, cands=None) -> list:
+    """Fill out from the page's markup; returns the page's links."""
+    ld, anchors, micro, meta = _contact_tags(soup)
+    # In trust order: the first source to fill a field wins it
+    _from_json_ld(ld, out, cands)
+    _from_links(anchors, out, cands)
+    _from_tags(micro, "microdata", out, cands)
+    _from_tags(meta, "meta", out, cands)
+    return anchors
+
+
+def structured_contacts(soup) -> dict:
+    """Phone and email as the page's markup declares them ("" where it doesn't)."""
+    out = {"phone": "", "email": ""}
+    if soup is not None:
+        _structured(soup, out)
+    return {"phone": out["phone"], "email": out["email"]}
+
+
+def extract_socials(soup) -> dict:
+    out = dict.fromkeys(SOCIAL_FIELDS, "")
+    if soup is not None:
+        _from_links(soup.find_all("a", href=True), out)
+    return {k: out[k] for k in SOCIAL_FIELDS}
+
+
+# ── Addresses ────────────────────────────────────────────────────────────────
+#
+# Scanned anchor-first instead of with one big regex: every street suffix
+# ("Street", "Ave", ...) is found in a single pass, then each hit looks at
+# most ADDR_BACK characters left for the civic number and ADDR_AHEAD right
+# for the province's localities and a postal code. Work per anchor is
+# bounded, so a page costs time linear in its length however many digits
+# and words it strings together.
+
+ADDR_BACK = 60
+ADDR_AHEAD = 80
+
+_SUFFIX = r"\b(?i:Street|St\b\.?|Avenue|Ave\b\.?|Boulevard|Blvd\b\.?|Drive|Road)(?!\w)"
+_SUFFIX_RE = re.compile(_SUFFIX)
+_CIVIC_RE = re.compile(r"\b\d+[A-Za-z]?\s+\w")
+_POSTAL_RE = re.compile(r"[A-Z]\d[A-Z]\s?\d[A-Z]\d\b")
+_STREET_CHARS = frozenset(" ,.'-")
+# Between two localities or a locality and the postal code: ", " and the like
+_JOIN_RE = re.compile(r"[\s,]{0,3}")
+
+# Province codes match case-sensitively ("ON", not "on"); names do not
+LOCALITIES = {
+    "AB": (("AB",), ("Alberta", "Edmonton", "Calgary")),
+    "BC": (("BC",), ("British Columbia", "Victoria", "Vancouver")),
+    "MB": (("MB",), ("Manitoba", "Winnipeg")),
+    "NB": (("NB",), ("New Brunswick", "Fredericton")),
+    "NL": (("NL",), ("Newfoundland", "St. John's", "St. John’s")),
+    "NS": (("NS",), ("Nova Scotia", "Halifax")),
+    "NT": (("NT", "NWT"), ("Northwest Territories", "Yellowknife")),
+    "NU": (("NU",), ("Nunavut", "Iqaluit")),
+    "ON": (("ON",), ("Ontario", "Toronto")),
+    "PE": (("PE", "PEI"), ("Prince Edward Island", "Charlottetown")),
+    "QC": (("QC",), ("Québec", "Quebec", "Montréal", "Montreal")),
+    "SK": (("SK",), ("Saskatchewan", "Regina", "Saskatoon")),
+    "YT": (("YT",), ("Yukon", "Whitehorse")),
+}
+
+
+def _locality_re(codes, names) -> re.Pattern:
+    alts = [rf"\b{re.escape(c)}\b" for c in codes]
+    alts += [rf"(?i:\b{re.escape(n)})(?!\w)" for n in names]
+    return re.compile("|".join(alts))
+
+
+_LOCALITY_RE = {p: _locality_re(*spec) for p, spec in LOCALITIES.items()}
+
+
+def _civic_start(text: str, anchor: int) -> int:
+    """Start of the "<number> <street name>" run ending at anchor, or -1."""
+    i, floor = anchor, max(0, anchor - ADDR_BACK)
+    while i > floor and (text[i - 1].isalnum() or text[i - 1] in _STREET_CHARS):
+        i -= 1
+    m = _CIVIC_RE.search(text, i, anchor)
+    return m.start() if m else -1
+
+
+def _locality_end(text: str, pos: int, locality: re.Pattern) -> int:
+    """End of the locality[, locality...][ postal code] run after pos, or -1."""
+    stop = min(len(text), pos + ADDR_AHEAD)
+    m = locality.search(text, pos, stop)
+    if m is None:
+        return -1
+    end = m.end()
+    while True:
+        gap = _JOIN_RE.match(text, end, stop).end()
+        nxt = locality.match(text, gap, stop) or _POSTAL_RE.match(text, gap, stop)
+        if nxt is None or nxt.end() == gap:
+            return end
+        end = nxt.end()
+
+
+def _address_at(text: str, anchor_start: int, anchor_end: int, locality: re.Pattern):
+    """(start, end) of the address around the suffix at text[anchor_start:anchor_end], or None."""
+    start = _civic_start(text, anchor_start)
+    if start < 0:
+        return None
+    end = _locality_end(text, anchor_end, locality)
+    if end < 0:
+        return None
+    return start, end
+
+
+def address_candidates(text: str, province: str) -> list[tuple[int, int, str]]:
+    """Every (start, end, address) in text, in order, for the given province."""
+    locality = _LOCALITY_RE[province]
+    out, last_end = [], -1
+    for m in _SUFFIX_RE.finditer(text or ""):
+        if m.start() < last_end:
+            continue
+        span = _address_at(text, m.start(), m.end(), locality)
+        if span:
+            out.append((*span, text[span[0]:span[1]].strip(" ,")))
+            last_end = span[1]
+    return out
+
+
+def extract_address(text: str, province: str) -> str:
+    """First street address in text that ends in one of the province's localities."""
+    found = address_candidates(text, province)
+    return found[0][2] if found else ""
+
+
+# ── One-pass contact scan ────────────────────────────────────────────────────
+
+# Phone, email and street-suffix anchors in a single alternation, so a
+# page's text is walked once for all three. Every match starts a word:
+# the gate rejects mid-word positions before any alternative is tried,
+# which keeps the combined scan cheaper than the three separate ones.
+# Phones must also end a word, so reference numbers are not cut up.
+# Email is tried first: a suffix word can open an address
+# (road.safety@..., st.johns@...) and would otherwise consume it.
+_TEXT_RE = re.compile(
+    rf"(?<!\w)(?:(?P<email>{EMAIL_RE.pattern})|(?P<phone>{PHONE_RE.pattern}(?!\d))|(?P<suffix>{_SUFFIX}))"
+)
+
+
+def _scan_text(text: str, province: str | None, out: dict, cands: list | None):
+    locality = _LOCALITY_RE.get(province)
+    last_end = -1
+    for m in _TEXT_RE.finditer(text):
+        field = m.lastgroup
+        if field == "suffix":
+            if locality is None or m.start() < last_end:
+                continue
+            span = _address_at(text, m.start(), m.end(), locality)
+            if span is None:
+                continue
+            _offer(out, cands, "address", text[span[0]:span[1]].strip(" ,"), "text", *span)
+            last_end = span[1]
+        else:
+            _offer(out, cands, field, m.group(0).strip(), "text", m.start(), m.end())
+        if cands is None and out["phone"] and out["email"] and (out["address"] or locality is None):
+            return
+
+
+def scan_contacts(soup, province: str | None = None, text: str | None = None,
+                  candidates: bool = False) -> dict:
+    """
+    Every contact field of a page in one go: phone, email, address (only
+    when province is given) and the four social links.
+
+    Structured markup and links are read first; the text (the page's
+    flattened text unless given) is scanned once, and only if a text
+    field is still empty. candidates=True adds "candidates": every value
+    seen as a Candidate, in the order found.
+    """
+    out = {"phone": "", "email": "", "address": "", **dict.fromkeys(SOCIAL_FIELDS, "")}
+    cands = [] if candidates else None
+    if soup is not None:
+        _structured(soup, out, cands)
+    if candidates or not (out["phone"] and out["email"] and (out["address"] or province is None)):
+        if text is None:
+            text = soup.get_text(" ", strip=True) if soup is not None else ""
+        _scan_text(text, province, out, cands)
+    if candidates:
+        out["candidates"] = cands
+    return out
+
+
+def extract_contacts(soup, text: str | None = None) -> dict:
+    """
+    {"phone", "email"} of a page: structured sources first, then a regex
+    over text (the page's flattened text unless given) for whatever is
+    still missing.
+    """
+    out = scan_contacts(soup, text=text)
+    return {"phone": out["phone"], "email": out["email"]}
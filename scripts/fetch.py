@@ -0,0 +1,370 @@
+"""
+Fetch-layer building blocks used by scripts.common.get_soup.
+"""
+import os
+import re
+import time
+import sqlite3
+import codecs
+import random
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import Future
+from threading import Lock
+
+
+# ── Request coalescing ───────────────────────────────────────────────────────
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+    The first caller runs fn(); everyone who arrives while it is in flight
+    blocks on the same Future and gets the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, fn):
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._calls[key] = fut
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+# ── Per-run document memo ────────────────────────────────────────────────────
+
+class LRUMemo:
+    """
+    Thread-safe LRU keyed by URL with an approximate memory cap.
+    Callers pass the cost of each entry (bytes); the least recently used
+    entries are evicted once the running total exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._items: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        self._total = 0
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value, cost: int):
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            self._items[key] = (value, cost)
+            self._total += cost
+            while self._total > self.max_bytes:
+                _, (_, c) = self._items.popitem(last=False)
+                self._total -= c
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+
+
+# ── Encoding resolution ──────────────────────────────────────────────────────
+
+_HEADER_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.I)
+# <meta charset> must appear in the first 1024 bytes per the HTML spec;
+# allow some slack for sloppy pages.
+_SNIFF_BYTES = 4096
+
+
+def _valid(name: str | None) -> str | None:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+class EncodingResolver:
+    """
+    Pick a document encoding without decoding the body: Content-Type
+    charset first, then a <meta charset> near the top of the page, then
+    whatever this domain turned out to use last time. Returns None when
+    none of those apply, leaving detection to the parser.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._by_domain: dict[str, str] = {}
+
+    def resolve(self, domain: str, content_type: str, body: bytes) -> str | None:
+        m = _HEADER_CHARSET_RE.search(content_type or "")
+        enc = _valid(m.group(1)) if m else None
+        if not enc:
+            m = _META_CHARSET_RE.search(body[:_SNIFF_BYTES])
+            enc = _valid(m.group(1).decode("ascii", "ignore")) if m else None
+        if enc:
+            self.learn(domain, enc)
+            return enc
+        with self._lock:
+            return self._by_domain.get(domain)
+
+    def learn(self, domain: str, encoding: str | None):
+        enc = _valid(encoding)
+        if enc:
+            with self._lock:
+                self._by_domain[domain] = enc
+
+
+# ── Retry policy ─────────────────────────────────────────────────────────────
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: float | None = None) -> float:
+    """
+    Full-jitter exponential backoff for the given (0-based) retry attempt.
+    A server-sent Retry-After wins when it asks for longer, up to cap.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+# ── Per-domain circuit breaker ───────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    Fail fast on hosts that keep failing. After `threshold` consecutive
+    failures a domain is open for `cooldown` seconds and allow() refuses
+    it; after that a single caller is let through as a half-open probe.
+    A success closes the circuit, a failure re-opens it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = Lock()
+        self._fails: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+        self._probing: set[str] = set()
+
+    def allow(self, domain: str) -> bool:
+        with self._lock:
+            until = self._open_until.get(domain)
+            if until is None:
+                return True
+            if time.monotonic() < until or domain in self._probing:
+                return False
+            self._probing.add(domain)
+            return True
+
+    def success(self, domain: str):
+        with self._lock:
+            self._fails.pop(domain, None)
+            self._open_until.pop(domain, None)
+            self._probing.discard(domain)
+
+    def failure(self, domain: str):
+        with self._lock:
+            n = self._fails.get(domain, 0) + 1
+            self._fails[domain] = n
+            if n >= self.threshold or domain in self._probing:
+                self._open_until[domain] = time.monotonic() + self.cooldown
+            self._probing.discard(domain)
+
+    def release(self, domain: str):
+        """The call ended without telling us anything about the host."""
+        with self._lock:
+            self._probing.discard(domain)
+
+    def is_open(self, domain: str) -> bool:
+        with self._lock:
+            return domain in self._open_until
+
+    def reset(self):
+        with self._lock:
+            self._fails.clear()
+            self._open_until.clear()
+            self._probing.clear()
+
+
+# ── Hedging ──────────────────────────────────────────────────────────────────
+
+class LatencyTracker:
+    """Rolling per-domain window of successful request latencies."""
+
+    def __init__(self, window: int = 64, min_samples: int = 8):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = Lock()
+        self._by_domain: dict[str, deque] = {}
+
+    def record(self, domain: str, seconds: float):
+        with self._lock:
+            d = self._by_domain.get(domain)
+            if d is None:
+                d = self._by_domain[domain] = deque(maxlen=self.window)
+            d.append(seconds)
+
+    def quantile(self, domain: str, q: float) -> float | None:
+        """None until the domain has min_samples observations."""
+        with self._lock:
+            d = self._by_domain.get(domain)
+            if d is None or len(d) < self.min_samples:
+                return None
+            vals = sorted(d)
+        return vals[min(len(vals) - 1, int(q * len(vals)))]
+
+
+class HedgeBudget:
+    """Allow at most `ratio` extra (hedge) requests per primary request."""
+
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self._lock = Lock()
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def request(self):
+        with self._lock:
+            self.requests += 1
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def won(self):
+        with self._lock:
+            self.wins += 1
+
+
+# ── URL canonicalization ─────────────────────────────────────────────────────
+
+class CanonicalUrls:
+    """
+    Redirect and dead-link memory that survives between runs (sqlite).
+    Permanent redirects (301/308) are remembered for redirect_ttl, so the
+    next request goes straight to the final URL. A URL that fails hard
+    in dead_after runs in a row is skipped for dead_ttl; failures count
+    once per process, so one bad run cannot kill a link by itself.
+    """
+
+    def __init__(self, path: str, redirect_ttl: float, dead_ttl: float, dead_after: int = 2):
+        self.path = path
+        self.redirect_ttl = redirect_ttl
+        self.dead_ttl = dead_ttl
+        self.dead_after = dead_after
+        self._lock = Lock()
+        self._db = None
+        # url -> [target, target_expires, failures, dead_until]
+        self._rows: dict[str, list] = {}
+        self._failed: set[str] = set()
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, target TEXT,"
+                " target_expires REAL, failures INTEGER, dead_until REAL)"
+            )
+            now = time.time()
+            for url, *row in db.execute("SELECT * FROM urls"):
+                if (row[1] or 0) > now or (row[3] or 0) > now or row[2]:
+                    self._rows[url] = row
+            self._db = db
+        return self._db
+
+    def _save(self, url: str, row: list):
+        self._rows[url] = row
+        db = self._conn()
+        db.execute("INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)", (url, *row))
+        db.commit()
+
+    def resolve(self, url: str) -> tuple[str, bool]:
+        """(URL to request, whether it is known dead)."""
+        now = time.time()
+        with self._lock:
+            self._conn()
+            seen = set()
+            while url not in seen:
+                seen.add(url)
+                row = self._rows.get(url)
+                if row is None:
+                    break
+                if (row[3] or 0) > now:
+                    return url, True
+                if row[0] and (row[1] or 0) > now:
+                    url = row[0]
+                    continue
+                break
+        return url, False
+
+    def redirect(self, src: str, dst: str):
+        with self._lock:
+            self._conn()
+            row = self._rows.get(src) or [None, None, 0, None]
+            if row[0] == dst and (row[1] or 0) > time.time() + self.redirect_ttl / 2:
+                return
+            self._save(src, [dst, time.time() + self.redirect_ttl, row[2], row[3]])
+
+    def failure(self, url: str):
+        with self._lock:
+            if url in self._failed:
+                return
+            self._failed.add(url)
+            self._conn()
+            target, expires, failures, dead_until = self._rows.get(url) or [None, None, 0, None]
+            failures = (failures or 0) + 1
+            if failures >= self.dead_after:
+                dead_until = time.time() + self.dead_ttl
+            self._save(url, [target, expires, failures, dead_until])
+
+    def success(self, url: str):
+        with self._lock:
+            self._conn()
+            row = self._rows.get(url)
+            if row is not None and (row[2] or row[3]):
+                self._save(url, [row[0], row[1], 0, None])
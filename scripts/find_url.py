@@ -1,6 +1,4 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, parse_qs, unquote
+from scripts.common import duckduckgo
 
 def find_ministry_url(ministry_name, additional_terms):
     """
@@ -15,24 +13,5 @@ def find_ministry_url(ministry_name, additional_terms):
         str or None: The cleaned URL of the top DuckDuckGo result, or None if no result found.
     """
     query = f"{ministry_name} {additional_terms} site"
-    base_url = "https://duckduckgo.com/html/"
-    headers = {"User-Agent": "Mozilla/5.0"}
-
-    try:
-        response = requests.get(base_url, params={"q": query}, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Select the first search result link
-        result = soup.select_one("a.result__a")
-        if not result:
-            return None
-
-        # Clean DuckDuckGo redirection URL
-        parsed = urlparse(result["href"])
-        qs = parse_qs(parsed.query)
-        return unquote(qs["uddg"][0]) if "uddg" in qs else result["href"]
-
-    except Exception as e:
-        print(f"Search failed for '{query}': {e}")
-        return None
+    # Through the shared session: archived, and replayed by --reextract
+    return duckduckgo(query) or None
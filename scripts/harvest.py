@@ -0,0 +1,102 @@
+"""
+Concurrent harvest of a region's agency index pages.
+
+Several regions list their agencies as headings followed by lists of
+links, spread over a handful of index pages (SOURCES). harvest() fetches
+every source at once and yields a page's rows as soon as it and the
+pages listed before it are parsed, so stream_scrape starts enriching
+after the first index arrives rather than the last, and duplicates
+across pages resolve the same way on every run. A ListingWalker turns
+one index page into rows in a single pass over its headings and items,
+carrying the latest heading as the parent ministry (or section) of the
+items under it.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+from scripts import budget
+from scripts.common import get_soup
+
+
+class ListingWalker:
+    """
+    One-pass heading/item walker over an index page.
+
+    headings: tags that open a new section ("" before the first one).
+    item: tag holding one entity; its first link gives name and URL.
+    links_only: skip items without a link (always so when item is "a").
+    min_name: shorter names are navigation noise and skipped.
+    type_fn: (section, default_type) -> type, for pages whose sections
+             carry the entity type.
+    """
+
+    def __init__(self, headings=("h2", "h3", "h4"), item="li", min_name=4,
+                 content=("main",), links_only=False, type_fn=None):
+        self.headings = frozenset(headings)
+        self.links_only = links_only or item == "a"
+        self.min_name = min_name
+        self.content = content
+        self.type_fn = type_fn
+        self._tags = [*headings, item]
+
+    def _content(self, soup):
+        for sel in self.content:
+            node = soup.select_one(sel)
+            if node is not None:
+                return node
+        return soup
+
+    def walk(self, soup, url: str, province: str, default_type: str) -> list[dict]:
+        rows = []
+        section = ""
+        for tag in self._content(soup).find_all(self._tags):
+            if tag.name in self.headings:
+                section = tag.get_text(strip=True)
+                continue
+            a = tag if tag.name == "a" else tag.find("a", href=True)
+            href = a.get("href", "") if a else ""
+            if self.links_only and not href:
+                continue
+            name = (a or tag).get_text(strip=True)
+            if len(name) < self.min_name:
+                continue
+            rows.append({
+                "province": province,
+                "type": self.type_fn(section, default_type) if self.type_fn else default_type,
+                "name": name, "description": "",
+                "website": urljoin(url, href) if href else "",
+                "phone": "", "email": "", "address": "", "parent_ministry": section,
+            })
+        return rows
+
+
+def harvest(session, sources, walker: ListingWalker, province: str, max_workers: int = 8):
+    """
+    Yield rows from every (url, default_type) source. Pages are fetched
+    concurrently but released in source order: a page's rows go out as
+    soon as it and every source before it are in. A name listed on several
+    sources keeps the row of the earliest one, so type and parent do not
+    depend on which page happened to arrive first.
+    """
+    def _one(url, default_type):
+        soup = get_soup(session, url)
+        return walker.walk(soup, url, province, default_type) if soup else []
+
+    seen = set()
+    ready, nxt = {}, 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sources)) or 1) as ex:
+        one = budget.carry(_one)
+        futs = {ex.submit(one, url, etype): i for i, (url, etype) in enumerate(sources)}
+        for fut in as_completed(futs):
+            i = futs[fut]
+            try:
+                ready[i] = fut.result()
+            except Exception as e:
+                print(f"[WARN] {sources[i][0]}: {e}")
+                ready[i] = []
+            while nxt in ready:
+                for r in ready.pop(nxt):
+                    if r["name"] not in seen:
+                        seen.add(r["name"])
+                        yield r
+                nxt += 1
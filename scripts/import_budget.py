@@ -0,0 +1,159 @@
+"""
+Start-up budget check: importing main.py and starting a region must stay cheap.
+
+1. Runs `python -X importtime -c "import main"` in a fresh interpreter and
+   fails if the cumulative import time goes over the budget or if any
+   heavy dependency (requests, bs4, lxml, pandas) gets pulled in before a
+   region is actually selected.
+2. Runs `main.py --regions XX` in a scratch directory up to its first
+   network call (an audit hook on socket.getaddrinfo/connect stops it
+   there) and fails if that takes longer than the start-up budget, if any
+   other region's modules were imported, or if bs4/lxml/pandas were
+   already loaded: parsing only starts once a page has arrived.
+
+    python scripts/import_budget.py                       # defaults: 50 ms, NT in 500 ms
+    python scripts/import_budget.py --budget-ms 30 --regions AB,ON --startup-ms 400
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from regions.registry import REGIONS
+
+HEAVY = ("requests", "bs4", "lxml", "pandas")
+# requests is what makes the first fetch, so it is allowed by then
+HEAVY_AT_FETCH = ("bs4", "lxml", "pandas")
+_MARK = "@@first-fetch "
+
+# Child: run main.py, report the clock and sys.modules at the first socket call
+_CHILD = """
+import json, os, runpy, sys, time
+t0 = time.perf_counter()
+def report(**fields):
+    sys.stdout.write(%(mark)r + json.dumps(fields) + "\\n")
+    sys.stdout.flush()
+    os._exit(0)
+def hook(event, args):
+    if event in ("socket.getaddrinfo", "socket.connect"):
+        mods = {n: getattr(m, "__file__", None) for n, m in list(sys.modules.items())}
+        report(ms=(time.perf_counter() - t0) * 1000, modules=mods)
+    # Never let a region that does not fetch run on into combine/diff
+    if event == "open" and isinstance(args[0], str):
+        mode, flags = args[1], args[2]
+        writing = any(c in mode for c in "wax+") if mode else flags & (os.O_WRONLY | os.O_RDWR)
+        if writing and os.path.abspath(args[0]).startswith(%(root)r + os.sep):
+            report(error="wrote " + args[0])
+sys.addaudithook(hook)
+sys.path.insert(0, %(root)r)
+sys.argv = ["main.py", "--regions", %(regions)r]
+runpy.run_path(os.path.join(%(root)r, "main.py"), run_name="__main__")
+"""
+
+
+def import_times(module: str = "main") -> dict[str, int]:
+    """Top-level module name -> cumulative import time in microseconds."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        times[name] = max(times.get(name, 0), int(cumulative))
+    return times
+
+
+def first_fetch(regions: str, timeout: float = 60) -> dict | None:
+    """
+    {"ms", "modules": {name: file}} at main.py's first network call,
+    {"error"} if it tried to write into the repo first, or None.
+    """
+    code = _CHILD % {"mark": _MARK, "root": str(ROOT), "regions": regions}
+    # A scratch cwd: whatever the region opens for writing lands there, not in data/
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.run([sys.executable, "-c", code], cwd=tmp,
+                              capture_output=True, text=True, timeout=timeout)
+    for line in proc.stdout.splitlines():
+        if line.startswith(_MARK):
+            return json.loads(line[len(_MARK):])
+    return None
+
+
+def _region_dirs(codes) -> list[Path]:
+    dirs = [ROOT / "regions" / c for c in codes]
+    return dirs + ([ROOT / "regions" / ".FED"] if "FED" in codes else [])
+
+
+def check_startup(regions: str, budget_ms: float) -> bool:
+    codes = [c.strip().upper() for c in regions.split(",")]
+    got = first_fetch(regions)
+    if got is None or "error" in got:
+        print(f"[FAIL] main.py --regions {regions} stopped before any fetch: "
+              f"{got['error'] if got else 'exited'}")
+        return False
+    print(f"main.py --regions {regions}: first fetch after {got['ms']:.1f} ms (budget {budget_ms:.0f} ms)")
+    mine = _region_dirs(codes)
+    others = _region_dirs([c for c in REGIONS if c not in codes])
+    stray = sorted(
+        name for name, path in got["modules"].items()
+        if path and any(Path(path).is_relative_to(d) for d in others)
+        and not any(Path(path).is_relative_to(d) for d in mine)
+    )
+    heavy = sorted(n for n in got["modules"] if n.split(".")[0] in HEAVY_AT_FETCH)
+
+    ok = True
+    if got["ms"] > budget_ms:
+        print("[FAIL] region start-up over budget")
+        ok = False
+    if stray:
+        print(f"[FAIL] unselected region modules imported: {', '.join(stray)}")
+        ok = False
+    if heavy:
+        print(f"[FAIL] imported before the first fetch: {', '.join(heavy)}")
+        ok = False
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--regions", default="NT", help="region(s) whose start-up is timed")
+    parser.add_argument("--startup-ms", type=float, default=500.0,
+                        help="budget from interpreter start to the region's first fetch")
+    args = parser.parse_args(argv)
+
+    times = import_times()
+    total_ms = times.get("main", 0) / 1000
+    heavy = sorted(n for n in times if n.split(".")[0] in HEAVY)
+
+    print(f"import main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    # Interpreter start-up (site, etc.) is reported too; skip anything bigger than main
+    top = [kv for kv in times.items() if kv[0] != "main" and kv[1] <= times.get("main", 0)]
+    for name, us in sorted(top, key=lambda kv: -kv[1])[:5]:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    ok = True
+    if total_ms > args.budget_ms:
+        print("[FAIL] over budget")
+        ok = False
+    if heavy:
+        print(f"[FAIL] heavy modules imported at start-up: {', '.join(heavy)}")
+        ok = False
+    if not check_startup(args.regions, args.startup_ms):
+        ok = False
+    if ok:
+        print("[OK]")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Persistent memo of extraction results, keyed by what went into them.
+
+A key is (extractor name, extractor version, content hash of the page,
+hash of the item the extractor was given). A byte-identical page handed
+to the same extractor with the same item gives back the stored row
+without being parsed. The version is the extractor's `version`
+attribute plus a hash of its code, of the source file it is defined in
+and of the shared contact helpers in scripts/extract.py, so editing any
+of those invalidates its entries by itself. Helpers in other modules
+(scripts/common.py, say) are not covered: bump `version` when one
+changes, or run with --fresh. --reextract never reads the memo.
+"""
+import os
+import sys
+import json
+import sqlite3
+from hashlib import blake2b
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from types import CodeType
+
+MISS = object()
+
+
+def content_hash(body: bytes) -> str:
+    return blake2b(body, digest_size=16).hexdigest()
+
+
+def _hash_const(const, h):
+    # Nested code objects (lambdas, genexprs) repr with their address and
+    # frozensets (`x in {...}`) in hash-seed order, so neither goes in by repr
+    if isinstance(const, CodeType):
+        h.update(const.co_code)
+        for c in const.co_consts:
+            _hash_const(c, h)
+    elif isinstance(const, (tuple, frozenset)):
+        h.update(b"(" if isinstance(const, tuple) else b"{")
+        items = const if isinstance(const, tuple) else sorted(const, key=repr)
+        for c in items:
+            _hash_const(c, h)
+        h.update(b")")
+    else:
+        h.update(repr(const).encode("utf-8", "replace"))
+        h.update(b",")
+
+
+# Helpers every extractor leans on; their source is part of each version
+HELPER_SOURCES = [Path(__file__).with_name("extract.py")]
+
+
+@lru_cache(maxsize=1)
+def _helpers_hash() -> bytes:
+    h = blake2b(digest_size=8)
+    for path in HELPER_SOURCES:
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+@lru_cache(maxsize=None)
+def _module_hash(module: str) -> bytes:
+    # The extractor's own file: module-level helpers, constants and regexes
+    path = getattr(sys.modules.get(module), "__file__", None)
+    return blake2b(Path(path).read_bytes(), digest_size=8).digest() if path else b""
+
+
+def extractor_version(fn) -> str:
+    h = blake2b(_helpers_hash(), digest_size=8)
+    h.update(_module_hash(fn.__module__))
+    _hash_const(fn.__code__, h)
+    return f"{getattr(fn, 'version', 0)}:{h.hexdigest()}"
+
+
+def versioned(version):
+    """Decorator: declare an extractor's version (bump to drop its memo)."""
+    def wrap(fn):
+        fn.version = version
+        return fn
+    return wrap
+
+
+class ExtractMemo:
+    """Thread-safe sqlite-backed store of JSON-serializable extraction results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS extract ("
+                " extractor TEXT, version TEXT, content TEXT, item TEXT, result TEXT,"
+                " PRIMARY KEY (extractor, version, content, item))"
+            )
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def key(fn, item, body: bytes) -> tuple:
+        item_json = json.dumps(item, sort_keys=True, default=str, ensure_ascii=False)
+        return (
+            f"{fn.__module__}.{fn.__qualname__}",
+            extractor_version(fn),
+            content_hash(body),
+            blake2b(item_json.encode("utf-8"), digest_size=16).hexdigest(),
+        )
+
+    def get(self, key: tuple):
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT result FROM extract WHERE extractor=? AND version=? AND content=? AND item=?",
+                key,
+            ).fetchone()
+        return MISS if row is None else json.loads(row[0])
+
+    def put(self, key: tuple, result):
+        try:
+            blob = json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO extract VALUES (?, ?, ?, ?, ?)", (*key, blob))
+            db.commit()
+
+    def prune(self, fn):
+        """Drop entries of fn written by any other version of it."""
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM extract WHERE extractor=? AND version<>?", (name, extractor_version(fn)))
+            db.commit()
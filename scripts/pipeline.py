@@ -0,0 +1,318 @@
+"""
+Streaming fetch -> parse/extract -> write pipeline for scrapers.
+
+I/O threads only move bytes; parsing and extraction are CPU-bound and can
+run in a process pool sized to the machine's cores, so they no longer
+serialize on the GIL behind every fetch thread in a main.py run. Workers
+exchange only bytes in and row dicts out.
+
+At most queue_depth items are in flight between the feeder and the sink:
+when the writer or the parsers fall behind, the feeder blocks instead of
+piling up pages, each tree is decomposed as soon as its row exists, and
+rows reach the sink one by one. Peak memory is set by queue depth, not by
+how many entities a region has.
+
+An extract step that needs a second page (a minister contact page, say)
+returns FollowUp(url, extract_fn, row). The fetch goes back on the shared
+queue as a child task and the row is finished when it comes back, so no
+thread sits idle holding a domain slot while it waits on a nested request.
+"""
+import os
+import sys
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+from threading import Lock, Semaphore, Thread
+from urllib.parse import urldefrag
+
+from scripts import budget
+from scripts.common import fetch_bytes, parse_html, resolve_encoding, CACHE_DIR
+from scripts.memo import ExtractMemo, MISS, content_hash
+
+# Off by default: main.py --processes turns it on for the whole run
+USE_PROCESSES = False
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def use_processes(enabled: bool = True):
+    global USE_PROCESSES
+    USE_PROCESSES = enabled
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent is full of fetch threads holding locks
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+def _ref(fn) -> tuple[str, str, str]:
+    """Picklable reference to a module-level function."""
+    mod = sys.modules[fn.__module__]
+    return fn.__module__, fn.__qualname__, os.path.dirname(getattr(mod, "__file__", "") or "")
+
+
+_loaded: dict[tuple, object] = {}
+
+
+def _load(ref):
+    fn = _loaded.get(ref)
+    if fn is None:
+        module, qualname, path = ref
+        # Region modules import each other by bare name off their own folder
+        if path and path not in sys.path:
+            sys.path.insert(0, path)
+        fn = importlib.import_module(module)
+        for part in qualname.split("."):
+            fn = getattr(fn, part)
+        _loaded[ref] = fn
+    return fn
+
+
+def _extract_in_worker(ref, body: bytes, encoding: str | None, item):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(body, "html.parser", from_encoding=encoding)
+    try:
+        return _load(ref)(soup, item)
+    finally:
+        soup.decompose()
+
+
+# ── Parent side ──────────────────────────────────────────────────────────────
+
+class FollowUp:
+    """Returned by an extract_fn that needs one more page to finish its row."""
+    __slots__ = ("url", "extract_fn", "item")
+
+    def __init__(self, url: str, extract_fn, item):
+        self.url = url
+        self.extract_fn = extract_fn
+        self.item = item
+
+
+def _row_website(session, row) -> str:
+    url = row.get("website", "")
+    return url if url.startswith("http") else ""
+
+
+def pair_url(session, item) -> str:
+    """url_fn for (url, name) items."""
+    return item[0]
+
+
+_DONE = object()
+_DROPPED = object()
+_UNRESOLVED = object()
+
+
+# ── Extraction memo ──────────────────────────────────────────────────────────
+# Byte-identical pages seen by the same extractor version with the same
+# item are not parsed again: the stored row comes back from disk.
+USE_MEMO = True
+_memo = ExtractMemo(os.path.join(CACHE_DIR, "extract.sqlite"))
+_pruned: set = set()
+_pruned_lock = Lock()
+
+
+def use_extract_memo(enabled: bool = True):
+    global USE_MEMO
+    USE_MEMO = enabled
+
+
+def _freeze(result):
+    if isinstance(result, FollowUp):
+        return {"__followup__": [result.url, list(_ref(result.extract_fn)), result.item]}
+    return result
+
+
+def _thaw(stored):
+    if isinstance(stored, dict) and "__followup__" in stored:
+        url, ref, item = stored["__followup__"]
+        return FollowUp(url, _load(tuple(ref)), item)
+    return stored
+
+
+def _memoized(extract_fn, item, body):
+    """(key, result) from the memo, result being MISS when not stored."""
+    with _pruned_lock:
+        prune = extract_fn not in _pruned
+        _pruned.add(extract_fn)
+    if prune:
+        _memo.prune(extract_fn)
+    key = _memo.key(extract_fn, item, body)
+    return key, _memo.get(key)
+
+
+def _extract(extract_fn, item, url, got):
+    if got is None:
+        return extract_fn(None, item)
+    body, ctype = got
+    if USE_MEMO:
+        key, stored = _memoized(extract_fn, item, body)
+        if stored is not MISS:
+            return _thaw(stored)
+        result = _parse_extract(extract_fn, item, url, body, ctype)
+        _memo.put(key, _freeze(result))
+        return result
+    return _parse_extract(extract_fn, item, url, body, ctype)
+
+
+def _parse_extract(extract_fn, item, url, body, ctype):
+    if USE_PROCESSES:
+        encoding = resolve_encoding(url, ctype, body)
+        return _parse_pool().submit(_extract_in_worker, _ref(extract_fn), body, encoding, item).result()
+    soup = parse_html(body, url, ctype)
+    try:
+        return extract_fn(soup, item)
+    finally:
+        soup.decompose()
+
+
+def stream_scrape(session, items, extract_fn, sink, url_fn=None, max_workers: int = 8,
+                  queue_depth: int = 32, reuse_same_pages: bool = False, dedupe_urls: bool = False,
+                  **fetch_kwargs) -> int:
+    """
+    For every item, url_fn(session, item) picks the page to fetch (it may do
+    I/O of its own, such as a search; default: the row's "website"), a fetch
+    thread downloads it, and extract_fn(soup, item) turns it into a row that
+    is handed to sink(row) on the calling thread, in completion order.
+    extract_fn gets soup=None when there is nothing to fetch or the fetch
+    failed, and may return a FollowUp to chain another page onto the row.
+    With USE_PROCESSES, extract functions run in the parse pool, so they
+    must be module-level. items may be a lazy iterable.
+    reuse_same_pages short-circuits a page whose bytes are identical to
+    one already extracted in this call (several entities sharing one
+    site): the fields the earlier extraction filled are copied onto the
+    new dict row instead of parsing again. Pages that merely look alike
+    are always extracted on their own. dedupe_urls skips an item whose URL (fragment and trailing
+    slash aside) an earlier item already has; url_fn then runs on the
+    feeder thread, so the first item in input order is the one kept.
+    Once the current time budget is spent, items still to come skip the
+    network and are extracted with soup=None, so their rows stay partial.
+    Returns the number of rows written.
+    """
+    url_fn = url_fn or _row_website
+    seen, dupes, claimed = {}, [], set()
+
+    def _reuse_or_extract(fn, item, url, got, fp):
+        # The very same page already extracted: take its page-derived fields
+        if fp is not None and isinstance(item, dict):
+            fragment = seen.get(fp)
+            if fragment is not None:
+                dupes.append(url)
+                return {**item, **fragment}
+            before = dict(item)
+            row = _extract(fn, item, url, got)
+            if isinstance(row, dict):
+                seen[fp] = {k: v for k, v in row.items() if before.get(k) != v}
+            return row
+        return _extract(fn, item, url, got)
+
+    n_parse = (os.cpu_count() or 1) if USE_PROCESSES else 2
+    slots = Semaphore(queue_depth)
+    fetch_q, parse_q, write_q = Queue(), Queue(), Queue()
+    fed = []
+
+    def feed():
+        n = 0
+        try:
+            for item in items:
+                slots.acquire()
+                if budget.expired():
+                    # Out of time: write the row from what the item already has
+                    budget.note(skipped=1)
+                    parse_q.put((extract_fn, item, None, None, None))
+                elif dedupe_urls:
+                    try:
+                        url = url_fn(session, item)
+                    except Exception as e:
+                        print(f"[WARN] fetch failed: {e}")
+                        url = ""
+                    key = urldefrag(url)[0].rstrip("/") if url else None
+                    if key is not None and key in claimed:
+                        dupes.append(url)
+                        write_q.put(_DROPPED)
+                    else:
+                        claimed.add(key)
+                        fetch_q.put((item, extract_fn, url, True))
+                else:
+                    fetch_q.put((item, extract_fn, _UNRESOLVED, True))
+                n += 1
+        finally:
+            fed.append(n)
+            write_q.put(_DONE)
+
+    def fetch():
+        while (job := fetch_q.get()) is not _DONE:
+            item, fn, url, top = job  # top: not a FollowUp
+            got = fp = None
+            try:
+                if url is _UNRESOLVED:
+                    url = url_fn(session, item)
+                got = fetch_bytes(session, url, **fetch_kwargs) if url else None
+                if reuse_same_pages and top and got is not None:
+                    fp = content_hash(got[0])
+            except Exception as e:
+                print(f"[WARN] fetch failed: {e}")
+            parse_q.put((fn, item, url, got, fp))
+
+    def parse():
+        while (job := parse_q.get()) is not _DONE:
+            fn, item, url, got, fp = job
+            try:
+                row = _reuse_or_extract(fn, item, url, got, fp)
+            except Exception as e:
+                print(f"[WARN] extract failed: {e}")
+                row = None
+            if isinstance(row, FollowUp):
+                # Child task: same slot, back of the fetch queue
+                if budget.expired():
+                    budget.note(skipped=1)
+                    parse_q.put((row.extract_fn, row.item, row.url, None, None))
+                else:
+                    fetch_q.put((row.item, row.extract_fn, row.url, False))
+            else:
+                write_q.put(_DROPPED if row is None else row)
+
+    fetchers = [Thread(target=budget.carry(fetch), daemon=True) for _ in range(max_workers)]
+    parsers = [Thread(target=budget.carry(parse), daemon=True) for _ in range(n_parse)]
+    for t in [Thread(target=budget.carry(feed), daemon=True), *fetchers, *parsers]:
+        t.start()
+
+    # Every admitted item ends in exactly one row or drop; stop once the
+    # feeder is finished and all of its items are accounted for.
+    written = finished = 0
+    while not fed or finished < fed[0]:
+        msg = write_q.get()
+        if msg is _DONE:
+            continue
+        finished += 1
+        slots.release()
+        if msg is not _DROPPED:
+            sink(msg)
+            written += 1
+    for q, n in ((fetch_q, max_workers), (parse_q, n_parse)):
+        for _ in range(n):
+            q.put(_DONE)
+    if dupes:
+        what = "repeated URLs dropped" if dedupe_urls else "identical pages reused an earlier extraction"
+        print(f"[pipeline] {len(dupes)} {what}")
+    return written
@@ -0,0 +1,173 @@
+"""
+Seed registry: every entity we know about and the website verified for it.
+
+data/seeds.json holds one record per entity (province, name, type,
+parent, website) under a schema version and a revision that is bumped
+on every save. It is loaded once into an index keyed by (province,
+normalized name), so a region resolves a known entity's website with a
+dict lookup instead of a DuckDuckGo search. URLs a region has confirmed
+(the page is the entity's, not just the top search hit) are added with
+remember() and written back by save() (also run at exit); unconfirmed
+search hits are never recorded, so a wrong guess cannot stick.
+
+    python scripts/seeds.py --rebuild   # (re)seed from the scraped data/ CSVs
+"""
+import os
+import re
+import json
+import atexit
+import unicodedata
+from pathlib import Path
+from threading import Lock
+
+SEEDS_PATH = os.environ.get("AGENCY_SEEDS", "data/seeds.json")
+SCHEMA_VERSION = 1
+FIELDS = ["province", "name", "type", "parent", "website"]
+
+_QUOTES = str.maketrans("‘’‛`´", "'''''")
+
+
+def normalize_name(name: str) -> str:
+    """'Société des alcools du Québec (SAQ)' -> 'societe des alcools du quebec saq'"""
+    name = unicodedata.normalize("NFKD", name.translate(_QUOTES))
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w']+", " ", name.casefold().replace("&", " and ")).split())
+
+
+class SeedRegistry:
+    """Thread-safe in-memory index over a seeds.json file."""
+
+    def __init__(self, path: str = SEEDS_PATH):
+        self.path = path
+        self.revision = 0
+        self._lock = Lock()
+        self._index = {}
+        self._dirty = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                doc = json.load(f)
+            if doc.get("version") != SCHEMA_VERSION:
+                raise ValueError(f"{path}: seed schema v{doc.get('version')}, expected v{SCHEMA_VERSION}")
+            self.revision = doc.get("revision", 0)
+            for rec in doc["entities"]:
+                self._index[self._key(rec["province"], rec["name"])] = rec
+
+    @staticmethod
+    def _key(province: str, name: str) -> tuple:
+        return province.upper(), normalize_name(name)
+
+    def __len__(self):
+        return len(self._index)
+
+    def lookup(self, province: str, name: str) -> dict | None:
+        return self._index.get(self._key(province, name))
+
+    def website(self, province: str, name: str) -> str:
+        rec = self.lookup(province, name)
+        return rec["website"] if rec else ""
+
+    def entities(self, province: str | None = None) -> list[dict]:
+        return [r for (p, _), r in self._index.items() if province is None or p == province.upper()]
+
+    def remember(self, province: str, name: str, website: str = "", type: str = "", parent: str = "",
+                 verified: bool = False):
+        """
+        Add an entity, or fill the blanks of a known one. A website already
+        on record is only replaced by a verified one: the caller has just
+        checked the new page, and the old one (e.g. a seed that no longer
+        confirms) lost that check.
+        """
+        key = self._key(province, name)
+        with self._lock:
+            rec = self._index.get(key)
+            if rec is None:
+                rec = self._index[key] = {
+                    "province": province.upper(), "name": name,
+                    "type": type, "parent": parent, "website": website,
+                }
+            else:
+                new = {"website": website, "type": type, "parent": parent}
+                filled = {k: v for k, v in new.items() if v and not rec[k]}
+                if verified and website and rec["website"] != website:
+                    filled["website"] = website
+                if not filled:
+                    return
+                rec.update(filled)
+            self._dirty.add(key)
+
+    def save(self):
+        """Write back pending changes, merged over whatever is on disk now."""
+        with self._lock:
+            if not self._dirty:
+                return
+            on_disk = SeedRegistry(self.path) if os.path.exists(self.path) else None
+            merged = dict(on_disk._index) if on_disk else {}
+            for key in self._dirty:
+                merged[key] = self._index[key]
+            self.revision = max(self.revision, on_disk.revision if on_disk else 0) + 1
+            _write(self.path, self.revision, merged.values())
+            self._dirty.clear()
+
+
+def _write(path: str, revision: int, records):
+    # One entity per line keeps diffs of the file reviewable
+    records = sorted(records, key=lambda r: (r["province"], normalize_name(r["name"])))
+    lines = ",\n".join("  " + json.dumps({k: r.get(k, "") for k in FIELDS}, ensure_ascii=False) for r in records)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f'{{"version": {SCHEMA_VERSION}, "revision": {revision}, "entities": [\n{lines}\n]}}\n')
+    os.replace(tmp, path)
+
+
+# ── Process-wide registry ────────────────────────────────────────────────────
+
+_registry = None
+_registry_lock = Lock()
+
+
+def registry() -> SeedRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SeedRegistry(SEEDS_PATH)
+                atexit.register(_registry.save)
+    return _registry
+
+
+def save():
+    if _registry is not None:
+        _registry.save()
+
+
+# ── Rebuild from scraped output ──────────────────────────────────────────────
+
+def rebuild(path: str = SEEDS_PATH) -> int:
+    """Seed every entity in the scraped CSVs, keeping any entry already on file."""
+    import sys
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from combine import iter_rows
+
+    reg = SeedRegistry(path)
+    for _, rows in iter_rows():
+        for row in rows:
+            if not row["province"] or not row["name"]:
+                continue
+            website = row["website"] if row["website"].startswith("http") else ""
+            reg.remember(row["province"], row["name"], website, row["type"], row["parent_ministry"])
+    reg.save()
+    return len(reg)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the seed registry.")
+    parser.add_argument("--rebuild", action="store_true", help="seed from the scraped data/ CSVs")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"[seeds] {rebuild()} entities → {SEEDS_PATH}")
+    reg = SeedRegistry(SEEDS_PATH)
+    with_url = sum(1 for r in reg.entities() if r["website"])
+    print(f"[seeds] revision {reg.revision}: {len(reg)} entities, {with_url} with a website")
@@ -0,0 +1,167 @@
+"""
+Sitemap-driven URL discovery.
+
+Most provincial sites publish sitemap.xml (usually advertised in
+robots.txt). load(session, base) streams it, following sitemap indexes
+and .gz files, keeps only the <loc> URLs, caches them on disk for a day
+and returns a SitemapIndex that resolves an entity name to a page by
+slug, so scrapers can look a page up locally instead of guessing URLs
+or searching for them.
+"""
+import os
+import re
+import json
+import time
+import zlib
+from urllib.parse import urlparse, urljoin
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+from scripts import budget, common
+from scripts.common import _dom_sem, CACHE_DIR
+from scripts.fetch import SingleFlight
+
+SITEMAP_TTL = 24 * 3600
+# Guard rails for runaway sitemap indexes
+MAX_SITEMAPS = 200
+MAX_URLS = 500_000
+
+_STOPWORDS = {"the", "of", "and", "for", "a", "an", "in", "on", "to"}
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _loose(slug: str) -> str:
+    """Slug without stopwords, for near matches ('board-of-x' ~ 'x-board')."""
+    return "-".join(sorted(w for w in slug.split("-") if w and w not in _STOPWORDS))
+
+
+class SitemapIndex:
+    """Slug -> URL lookup over every page listed in a site's sitemaps."""
+
+    def __init__(self, base: str, urls: list[str]):
+        self.base = base
+        self.urls = urls
+        self._exact: dict[str, str] = {}
+        self._loose: dict[str, str] = {}
+        # Shortest path wins when several pages end in the same slug
+        for url in sorted(urls, key=len):
+            slug = _slug(urlparse(url).path.rstrip("/").rsplit("/", 1)[-1])
+            if slug:
+                self._exact.setdefault(slug, url)
+                self._loose.setdefault(_loose(slug), url)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def lookup(self, name: str) -> str | None:
+        slug = _slug(name)
+        return self._exact.get(slug) or self._loose.get(_loose(slug))
+
+
+# ── Streaming fetch / parse ──────────────────────────────────────────────────
+
+def _stream_locs(session, url: str, timeout: int = 30):
+    """Yield (tag, loc) for every <sitemap>/<url> entry, parsing as bytes arrive."""
+    parser = XMLPullParser(events=("end",))
+    gunzip = None
+    with _dom_sem(url):
+        with session.get(url, timeout=max(0.1, budget.clamp(timeout)), stream=True) as resp:
+            resp.raise_for_status()
+            for i, chunk in enumerate(resp.iter_content(65536)):
+                # .xml.gz may or may not have been decoded in transit: sniff it
+                if i == 0 and chunk[:2] == b"\x1f\x8b":
+                    gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+                yield from _drain(parser)
+    parser.close()
+    yield from _drain(parser)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _drain(parser):
+    for _, el in parser.read_events():
+        tag = _local(el.tag)
+        if tag in ("url", "sitemap"):
+            loc = next((c.text for c in el if _local(c.tag) == "loc" and c.text), None)
+            if loc:
+                yield tag, loc.strip()
+            el.clear()
+
+
+def _roots(session, base: str) -> list[str]:
+    """Sitemaps advertised in robots.txt, else the conventional location."""
+    try:
+        r = session.get(urljoin(base, "/robots.txt"), timeout=max(0.1, budget.clamp(10)))
+        if r.ok:
+            found = re.findall(r"(?im)^\s*sitemap:\s*(\S+)", r.text)
+            if found:
+                return found
+    except Exception as e:
+        print(f"[WARN] {base}/robots.txt: {e}")
+    return [urljoin(base, "/sitemap.xml")]
+
+
+def _crawl(session, base: str) -> list[str]:
+    queue, seen, urls = _roots(session, base), set(), []
+    while queue and len(seen) < MAX_SITEMAPS and len(urls) < MAX_URLS:
+        sm = queue.pop(0)
+        if sm in seen:
+            continue
+        seen.add(sm)
+        try:
+            for tag, loc in _stream_locs(session, sm):
+                # <sitemap> entries of an index point at more sitemaps
+                (queue if tag == "sitemap" else urls).append(loc)
+        except (ParseError, zlib.error) as e:
+            print(f"[WARN] {sm}: bad sitemap ({e})")
+        except Exception as e:
+            print(f"[WARN] {sm}: {e}")
+    return urls[:MAX_URLS]
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+_loaded: dict[str, SitemapIndex] = {}
+_flight = SingleFlight()
+
+
+def _cache_path(base: str) -> str:
+    return os.path.join(CACHE_DIR, "sitemaps", f"{urlparse(base).netloc}.json")
+
+
+def _load(session, base: str) -> SitemapIndex:
+    path = _cache_path(base)
+    urls = None
+    try:
+        # Replaying the archive: whatever was cached is the best we have
+        if common.REPLAY or time.time() - os.path.getmtime(path) < SITEMAP_TTL:
+            with open(path, encoding="utf-8") as f:
+                urls = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if urls is None:
+        urls = _crawl(session, base)
+        if urls:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(urls, f)
+    print(f"[sitemap] {base}: {len(urls)} pages")
+    index = _loaded[base] = SitemapIndex(base, urls)
+    return index
+
+
+def load(session, base: str) -> SitemapIndex:
+    """
+    Index of every page in base's sitemaps: from memory, then from the
+    disk cache if younger than SITEMAP_TTL, else fetched (once, however
+    many threads ask). An empty index means the site has no usable sitemap.
+    """
+    index = _loaded.get(base)
+    if index is None:
+        index = _flight.do(base, lambda: _loaded[base] if base in _loaded else _load(session, base))
+    return index
@@ -0,0 +1,98 @@
+"""
+Fetch every statically known URL ahead of a scrape.
+
+Imports the selected regions, collects every URL declared in their
+module-level constants (minister_urls, *_ENTITIES, *_MUSEUMS, SOURCES,
+INDEX_URL, ...) and fetches them in one parallel pass, interleaved
+round-robin across domains so no site gets more than its per-domain
+slots while the others wait. Fetched pages land in the page archive
+(and the in-process memo when run from main.py --warm), so a scrape run
+with --max-age serves them without touching the network.
+"""
+import argparse
+import importlib
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+from pathlib import Path
+from urllib.parse import urlparse
+
+ROOT = Path(__file__).resolve().parent
+sys.path.append(str(ROOT))
+from regions.registry import REGIONS
+
+
+def _urls_in(value):
+    if isinstance(value, str):
+        if value.startswith(("http://", "https://")):
+            yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _urls_in(v)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for v in value:
+            yield from _urls_in(v)
+
+
+def _declared(name: str) -> bool:
+    # Constants by convention, plus the federal minister URL config
+    return name.isupper() or name == "minister_urls"
+
+
+def collect(modules=None) -> list[str]:
+    """Every URL declared at module level by the given region entry points."""
+    regions_dir = ROOT / "regions"
+    for m in modules or REGIONS.values():
+        try:
+            importlib.import_module(m)
+        except Exception as e:
+            print(f"[WARN] warm: cannot import {m}: {e}")
+    urls = []
+    for mod in list(sys.modules.values()):
+        path = getattr(mod, "__file__", None)
+        if not path or not Path(path).resolve().is_relative_to(regions_dir):
+            continue
+        for name, value in vars(mod).items():
+            if _declared(name):
+                urls.extend(_urls_in(value))
+    return list(dict.fromkeys(u.split("#")[0] for u in urls))
+
+
+def _domain_fair(urls: list[str]) -> list[str]:
+    """Round-robin across domains: a, b, c, a, b, c, ... instead of a, a, a, b, ..."""
+    by_domain = defaultdict(list)
+    for u in urls:
+        by_domain[urlparse(u).netloc].append(u)
+    return [u for batch in zip_longest(*by_domain.values()) for u in batch if u]
+
+
+def warm(modules=None, max_workers: int = 32) -> int:
+    from scripts.common import make_session, fetch_bytes
+
+    urls = _domain_fair(collect(modules))
+    domains = len({urlparse(u).netloc for u in urls})
+    print(f"[warm] {len(urls)} URLs across {domains} domains…")
+    session = make_session()
+    t0, ok = time.perf_counter(), 0
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futs = [ex.submit(fetch_bytes, session, u) for u in urls]
+        for fut in as_completed(futs):
+            try:
+                ok += fut.result() is not None
+            except Exception as e:
+                print(f"[WARN] warm: {e}")
+    print(f"[warm] {ok}/{len(urls)} fetched in {time.perf_counter() - t0:.1f}s")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch statically known URLs into the page archive.")
+    parser.add_argument("--regions", metavar="AB,ON", help="comma-separated region codes (default: all)")
+    args = parser.parse_args()
+    codes = [c.strip().upper() for c in (args.regions or "").split(",") if c.strip()]
+    unknown = [c for c in codes if c not in REGIONS]
+    if unknown:
+        parser.error(f"unknown region(s): {', '.join(unknown)}")
+    warm([REGIONS[c] for c in codes] or None)